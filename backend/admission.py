@@ -0,0 +1,125 @@
+import math
+import threading
+import time
+
+from metrics import registry
+
+admission_admitted = registry.counter(
+    'admission_admitted_total', 'Requests admitted by the admission controller, by endpoint and cost')
+admission_shed = registry.counter(
+    'admission_shed_total', 'Requests refused by the admission controller, by endpoint and reason')
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is over its client's rate or the concurrency cap"""
+
+    def __init__(self, status, reason, retry_after):
+        super().__init__(f"Request shed: {reason}")
+        self.status = status
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class TokenBuckets:
+    """One token bucket per client: ``rate`` requests per second, bursts of up to ``burst``.
+
+    Clients idle long enough to have refilled are indistinguishable from new
+    ones, so they are dropped whenever more than ``max_clients`` are tracked.
+    """
+
+    def __init__(self, rate, burst, max_clients=10000):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.max_clients = max_clients
+        self._buckets = {}  # client -> (tokens, updated)
+        self._lock = threading.Lock()
+
+    def take(self, client, cost=1):
+        """Spend ``cost`` tokens; returns 0 when allowed, else seconds until it would be"""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(client, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            if tokens >= cost:
+                self._buckets[client] = (tokens - cost, now)
+                wait = 0.0
+            else:
+                self._buckets[client] = (tokens, now)
+                wait = (cost - tokens) / self.rate
+
+            if len(self._buckets) > self.max_clients:
+                refill = self.burst / self.rate
+                self._buckets = {key: value for key, value in self._buckets.items() if now - value[1] < refill}
+        return wait
+
+
+class AdmissionController:
+    """Concurrency cap and per-client rate limit in front of the prediction endpoints.
+
+    Work that has to run the model may hold at most ``max_concurrent`` slots;
+    cheap answers (scenario cache hits, probability table lookups) may also use
+    ``cheap_headroom`` more, so they are still served when uncached work has
+    filled the cap. Synchronous database writes are capped separately at
+    ``max_writes``, so cheap answers cannot pile up on the database either.
+    Over budget, requests fail fast with AdmissionRejected instead of
+    queueing. Limits apply per process.
+    """
+
+    def __init__(self, max_concurrent=64, cheap_headroom=32, rate=0.0, burst=20, max_writes=0):
+        self.configure(max_concurrent, cheap_headroom, rate, burst, max_writes)
+        registry.gauge('admission_in_flight', 'Requests holding an admission slot', lambda: self._in_flight)
+        registry.gauge('admission_writes_in_flight', 'Requests holding a database write slot', lambda: self._writing)
+
+    def configure(self, max_concurrent, cheap_headroom, rate, burst, max_writes=0):
+        self.max_concurrent = max_concurrent
+        self.cheap_headroom = cheap_headroom
+        self.max_writes = max_writes
+        self.buckets = TokenBuckets(rate, burst) if rate > 0 else None
+        self._in_flight = 0
+        self._writing = 0
+        self._lock = threading.Lock()
+
+    def check_rate(self, client, endpoint):
+        if self.buckets is None:
+            return
+        wait = self.buckets.take(client)
+        if wait > 0:
+            admission_shed.inc(endpoint=endpoint, reason='rate_limited')
+            raise AdmissionRejected(429, 'rate_limited', max(1, math.ceil(wait)))
+
+    def acquire(self, endpoint, cheap=False):
+        """Take a slot (released by calling the returned function) or raise AdmissionRejected"""
+        if self.max_concurrent <= 0:
+            admission_admitted.inc(endpoint=endpoint, cost='cheap' if cheap else 'expensive')
+            return lambda: None
+
+        limit = self.max_concurrent + (self.cheap_headroom if cheap else 0)
+        with self._lock:
+            if self._in_flight >= limit:
+                admission_shed.inc(endpoint=endpoint, reason='concurrency')
+                raise AdmissionRejected(503, 'concurrency', 1)
+            self._in_flight += 1
+        admission_admitted.inc(endpoint=endpoint, cost='cheap' if cheap else 'expensive')
+
+        def release():
+            with self._lock:
+                self._in_flight -= 1
+        return release
+
+    def acquire_write(self, endpoint):
+        """Take a database write slot (released by calling the returned function) or raise AdmissionRejected"""
+        if self.max_writes <= 0:
+            return lambda: None
+        with self._lock:
+            if self._writing >= self.max_writes:
+                admission_shed.inc(endpoint=endpoint, reason='writes')
+                raise AdmissionRejected(503, 'writes', 1)
+            self._writing += 1
+
+        def release():
+            with self._lock:
+                self._writing -= 1
+        return release
+
+
+admission = AdmissionController()
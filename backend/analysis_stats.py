@@ -0,0 +1,102 @@
+import copy
+
+from dataset import load_matches
+from season_counts import SeasonCounts
+
+MATCHES = 'matches'
+
+
+class AnalysisAggregates:
+    """Counters behind /analysis/stats, computed in one grouped pass over the matches.
+
+    Only counts are stored, as running totals by season; the rates in the
+    response are derived on output, so any season range is a subtraction and
+    the aggregates can be extended without rescanning rows.
+    """
+
+    def __init__(self, seasons=()):
+        self.season_matches = SeasonCounts(seasons)      # season -> matches (single key)
+        self.toss_decision_wins = SeasonCounts(seasons)  # decision -> matches won by the toss winner
+        self.team_toss_wins = SeasonCounts(seasons)      # team -> tosses won
+        self.team_toss_match_wins = SeasonCounts(seasons)  # team -> tosses won that led to a match win
+        self.venue_matches = SeasonCounts(seasons)
+        self.venue_toss_match_wins = SeasonCounts(seasons)
+
+    @classmethod
+    def from_frame(cls, df):
+        won = (df['toss_winner'] == df['winner']).astype(int)
+        grouped = df.assign(toss_win_match_win=won, all_matches=MATCHES)
+        seasons = df['season'].unique().tolist()
+
+        def totals(column):
+            return grouped.groupby(['season', column], observed=True)['toss_win_match_win'].agg(['size', 'sum'])
+
+        aggregates = cls()
+        aggregates.season_matches = SeasonCounts.from_counts(seasons, totals('all_matches')['size'])
+        aggregates.toss_decision_wins = SeasonCounts.from_counts(seasons, totals('toss_decision')['sum'])
+
+        by_team = totals('toss_winner')
+        aggregates.team_toss_wins = SeasonCounts.from_counts(seasons, by_team['size'])
+        aggregates.team_toss_match_wins = SeasonCounts.from_counts(seasons, by_team['sum'])
+
+        by_venue = totals('venue')
+        aggregates.venue_matches = SeasonCounts.from_counts(seasons, by_venue['size'])
+        aggregates.venue_toss_match_wins = SeasonCounts.from_counts(seasons, by_venue['sum'])
+        return aggregates
+
+    @classmethod
+    def from_csv(cls, path):
+        return cls.from_frame(load_matches(path))
+
+    def with_matches(self, rows):
+        """Copy of the aggregates with new matches applied.
+
+        Only the rows of the keys the matches touch are copied (every row when
+        a match opens a new season).
+        """
+        updated = copy.copy(self)
+        for name, counts in vars(self).items():
+            setattr(updated, name, counts.copy())
+        for row in rows:
+            season = row['season']
+            won = int(bool(row.get('winner')) and row.get('toss_winner') == row.get('winner'))
+            updated.season_matches.add(season, MATCHES)
+            updated.toss_decision_wins.add(season, row['toss_decision'], won)
+            if row.get('toss_winner'):
+                updated.team_toss_wins.add(season, row['toss_winner'])
+                updated.team_toss_match_wins.add(season, row['toss_winner'], won)
+            if row.get('venue'):
+                updated.venue_matches.add(season, row['venue'])
+                updated.venue_toss_match_wins.add(season, row['venue'], won)
+        return updated
+
+    def seasons(self, season_from=None, season_to=None):
+        """Seasons with matches in the (inclusive) range"""
+        lo, hi = self.season_matches.bounds(season_from, season_to)
+        return self.season_matches.seasons[lo:hi]
+
+    def to_dict(self, teams, season_from=None, season_to=None):
+        seasons = (season_from, season_to)
+        total = self.season_matches.get(MATCHES, *seasons)
+        toss_impact = {
+            'toss_bat_win_rate': self.toss_decision_wins.get('bat', *seasons) / total if total else 0.0,
+            'toss_field_win_rate': self.toss_decision_wins.get('field', *seasons) / total if total else 0.0
+        }
+
+        team_stats = {}
+        for team in teams:
+            won_toss = self.team_toss_wins.get(team, *seasons)
+            team_stats[team] = self.team_toss_match_wins.get(team, *seasons) / won_toss if won_toss > 0 else 0
+
+        venue_toss_match_wins = self.venue_toss_match_wins.counts(*seasons)
+        venue_stats = {
+            venue: venue_toss_match_wins.get(venue, 0) / matches
+            for venue, matches in self.venue_matches.counts(*seasons).items()
+        }
+
+        return {
+            'toss_impact': toss_impact,
+            'team_stats': team_stats,
+            'venue_stats': venue_stats,
+            'seasons': self.seasons(*seasons)
+        }
@@ -0,0 +1,99 @@
+"""Helpers shared by the derived on-disk artifacts (flat model, columnar dataset).
+
+Each artifact is a directory of files plus a meta.json that records the size
+and mtime of the source files it was built from, so a changed source makes
+the artifact stale without hashing anything.
+"""
+import contextlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+META_JSON = 'meta.json'
+
+
+def stat_signature(path):
+    """(mtime_ns, size) of ``path``: changes whenever the file is rewritten"""
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def file_signature(*paths):
+    """stat_signature of each path, None for the ones that do not exist"""
+    signature = []
+    for path in paths:
+        try:
+            signature.append(stat_signature(path))
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+
+def source_signature(sources):
+    """Meta entries recording the source files (``{key: path}``) an artifact was built from"""
+    signature = {}
+    for key, path in sources.items():
+        mtime_ns, size = stat_signature(path)
+        signature[f'{key}_size'] = size
+        signature[f'{key}_mtime_ns'] = mtime_ns
+    return signature
+
+
+def read_meta(out_dir):
+    with open(os.path.join(out_dir, META_JSON)) as f:
+        return json.load(f)
+
+
+def artifact_is_current(out_dir, sources):
+    """True if ``out_dir`` exists and was built from the sources as they are now.
+
+    Without its sources (e.g. an image shipping only the artifact) an existing
+    artifact counts as current.
+    """
+    if not os.path.exists(os.path.join(out_dir, META_JSON)):
+        return False
+    if not all(os.path.exists(path) for path in sources.values()):
+        return True
+    meta = read_meta(out_dir)
+    return all(meta.get(key) == value for key, value in source_signature(sources).items())
+
+
+def warn_if_stale(out_dir, source_path, command):
+    """Log that an existing ``out_dir`` is ignored in favour of ``source_path``"""
+    if os.path.exists(os.path.join(out_dir, META_JSON)):
+        logger.warning(f"{out_dir} is stale; loading {source_path} instead (run '{command}' to refresh)")
+
+
+@contextlib.contextmanager
+def replace_dir(out_dir, prefix):
+    """Yield an empty directory next to ``out_dir`` that replaces it once the block succeeds.
+
+    The old copy is renamed aside before the new one is renamed into place and
+    only deleted afterwards, so ``out_dir`` never holds a partial artifact.
+    Processes that still map files from the old copy keep their pages.
+    """
+    parent = os.path.dirname(os.path.abspath(out_dir))
+    tmp_dir = tempfile.mkdtemp(prefix=prefix, dir=parent)
+    try:
+        yield tmp_dir
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    old_dir = None
+    if os.path.exists(out_dir):
+        old_dir = tempfile.mkdtemp(prefix=f'{prefix}old-', dir=parent)
+        os.replace(out_dir, old_dir)
+    try:
+        os.replace(tmp_dir, out_dir)
+    except OSError:
+        if old_dir is not None:
+            os.replace(old_dir, out_dir)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    if old_dir is not None:
+        shutil.rmtree(old_dir, ignore_errors=True)
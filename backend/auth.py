@@ -1,10 +1,13 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 from werkzeug.security import generate_password_hash, check_password_hash
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
 from models import db, User
 import re
 from datetime import timedelta
+from functools import wraps
 from flask_bcrypt import Bcrypt
+from hashing import HashPoolBusy, hash_pool
+from metrics import stage
 
 auth = Blueprint('auth', __name__)
 bcrypt = Bcrypt()
@@ -18,8 +21,42 @@ def is_valid_password(password):
         return False, "Password must be at least 6 characters long"
     return True, None
 
+def hash_password(password):
+    return hash_pool.run('hash', bcrypt.generate_password_hash, password).decode('utf-8')
+
+def verify_password(password_hash, password):
+    return hash_pool.run('verify', bcrypt.check_password_hash, password_hash, password)
+
+def busy_response(error):
+    response = jsonify({'error': 'Authentication is busy, please retry shortly'})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+def current_user_id():
+    """The signed-in user's id; JWT identities are strings, the user_id columns are integers"""
+    return int(get_jwt_identity())
+
+def admin_required(view):
+    """Like jwt_required, but the user must also be listed in ADMIN_USERS"""
+    @wraps(view)
+    @jwt_required()
+    def wrapper(*args, **kwargs):
+        user = db.session.get(User, current_user_id())
+        if user is None or user.username not in current_app.config.get('ADMIN_USERS', []):
+            return jsonify({'error': 'Admin access required'}), 403
+        return view(*args, **kwargs)
+    return wrapper
+
 def init_auth(app):
     bcrypt.init_app(app)
+    hash_pool.configure(
+        workers=app.config.get('AUTH_HASH_WORKERS', 2),
+        max_pending=app.config.get('AUTH_HASH_MAX_PENDING', 8),
+        queue_budget=app.config.get('AUTH_HASH_QUEUE_BUDGET', 1.0)
+    )
+
+def ensure_default_user():
     # Create default test account if it doesn't exist
     default_username = 'PRAVESH'
     default_password = 'PRAVESH'
@@ -37,13 +74,15 @@ def register_user(username, email, password):
         if User.query.filter_by(email=email).first():
             return {"error": "Email already exists"}, 400
 
-        hashed_password = bcrypt.generate_password_hash(password).decode('utf-8')
+        hashed_password = hash_password(password)
         new_user = User(username=username, email=email, password=hashed_password)
         db.session.add(new_user)
         db.session.commit()
 
         return {"message": "User created successfully"}, 201
 
+    except HashPoolBusy as e:
+        return busy_response(e)
     except Exception as e:
         db.session.rollback()
         return {"error": f"Registration failed: {str(e)}"}, 500
@@ -51,11 +90,14 @@ def register_user(username, email, password):
 def login_user(username, password):
     user = User.query.filter_by(username=username).first()
 
-    if not user or not bcrypt.check_password_hash(user.password, password):
-        return {"error": "Invalid username or password"}, 401
+    try:
+        if not user or not verify_password(user.password, password):
+            return {"error": "Invalid username or password"}, 401
+    except HashPoolBusy as e:
+        return busy_response(e)
 
     access_token = create_access_token(
-        identity=user.id,
+        identity=str(user.id),
         expires_delta=timedelta(days=1)
     )
 
@@ -86,18 +128,21 @@ def register():
         if not is_valid:
             return jsonify({'error': password_error}), 400
 
-        if User.query.filter_by(username=username).first():
-            return jsonify({'error': 'Username already exists'}), 400
+        with stage('auth.register', 'lookup'):
+            if User.query.filter_by(username=username).first():
+                return jsonify({'error': 'Username already exists'}), 400
 
-        if User.query.filter_by(email=email).first():
-            return jsonify({'error': 'Email already registered'}), 400
+            if User.query.filter_by(email=email).first():
+                return jsonify({'error': 'Email already registered'}), 400
 
-        hashed_password = bcrypt.generate_password_hash(password).decode('utf-8')
+        with stage('auth.register', 'hash'):
+            hashed_password = hash_password(password)
         user = User(username=username, email=email, password=hashed_password)
 
         db.session.add(user)
         try:
-            db.session.commit()
+            with stage('auth.register', 'commit'):
+                db.session.commit()
         except Exception as commit_error:
             db.session.rollback()
             return jsonify({'error': 'Failed to save user to database', 'details': str(commit_error)}), 500
@@ -110,6 +155,8 @@ def register():
             }
         }), 201
 
+    except HashPoolBusy as e:
+        return busy_response(e)
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': 'Registration failed', 'details': str(e)}), 500
@@ -121,14 +168,18 @@ def login():
         if not all(k in data for k in ['username', 'password']):
             return jsonify({'error': 'Missing username or password'}), 400
 
-        user = User.query.filter_by(username=data['username']).first()
-        if not user or not bcrypt.check_password_hash(user.password, data['password']):
+        with stage('auth.login', 'lookup'):
+            user = User.query.filter_by(username=data['username']).first()
+        with stage('auth.login', 'verify'):
+            verified = user is not None and verify_password(user.password, data['password'])
+        if not verified:
             return jsonify({'error': 'Invalid username or password'}), 401
 
-        access_token = create_access_token(
-            identity=user.id,
-            expires_delta=timedelta(days=1)
-        )
+        with stage('auth.login', 'token'):
+            access_token = create_access_token(
+                identity=str(user.id),
+                expires_delta=timedelta(days=1)
+            )
 
         return jsonify({
             'access_token': access_token,
@@ -139,6 +190,8 @@ def login():
             }
         }), 200
 
+    except HashPoolBusy as e:
+        return busy_response(e)
     except Exception as e:
         return jsonify({'error': 'Login failed. Please try again.', 'details': str(e)}), 500
 
@@ -146,7 +199,7 @@ def login():
 @jwt_required()
 def profile():
     try:
-        user_id = get_jwt_identity()
+        user_id = current_user_id()
         user = User.query.get(user_id)
         if not user:
             return jsonify({'error': 'User not found'}), 404
@@ -0,0 +1,319 @@
+"""Benchmarks for the backend, saved as JSON so runs can be compared.
+
+    python bench.py micro [--repeat 200] [--out FILE]
+    python bench.py load [--requests 500] [--concurrency 8] [--out FILE]
+    python bench.py compare BASELINE.json CANDIDATE.json
+
+``micro`` times the building blocks in this process: encoding, predict_proba,
+the stats indexes and the prediction insert. ``load`` starts the API in a
+child process on a temporary SQLite database and drives each endpoint over
+HTTP from a pool of client threads, reporting throughput and p50/p95/p99
+latency. Everything runs offline against the files in this directory.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from teams import VALID_CITIES, VALID_TEAMS
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(HERE, 'benchmark_results')
+
+DEFAULT_USER = {'username': 'PRAVESH', 'password': 'PRAVESH'}
+
+
+def random_fixture(rng):
+    team1, team2 = rng.sample(VALID_TEAMS, 2)
+    return {
+        'team1': team1,
+        'team2': team2,
+        'toss_winner': rng.choice([team1, team2]),
+        'toss_decision': rng.choice(['bat', 'field']),
+        'city': rng.choice(VALID_CITIES)
+    }
+
+
+def percentiles(samples):
+    """Summary of latencies in seconds"""
+    ordered = sorted(samples)
+
+    def rank(q):
+        return ordered[min(len(ordered) - 1, max(0, int(round(q * len(ordered))) - 1))]
+
+    return {
+        'count': len(ordered),
+        'mean': statistics.fmean(ordered),
+        'p50': rank(0.50),
+        'p95': rank(0.95),
+        'p99': rank(0.99),
+        'max': ordered[-1]
+    }
+
+
+def time_calls(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return percentiles(samples)
+
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=HERE, capture_output=True,
+                                text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'timestamp': datetime.utcnow().isoformat(timespec='seconds') + 'Z',
+        'git_commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count()
+    }
+
+
+def run_micro(repeat=200):
+    from analysis_stats import AnalysisAggregates
+    from dataset import load_matches
+    from encoder import FeatureEncoder
+    from match_stats import MatchStatsIndex
+    from model_store import load_model, load_pickle
+    from probability_table import ProbabilityTable
+
+    rng = random.Random(42)
+    fixture = random_fixture(rng)
+    batch = [random_fixture(rng) for _ in range(100)]
+
+    forest, columns = load_model('flat')
+    model, _ = load_pickle()
+    encoder = FeatureEncoder(columns)
+    row = encoder.encode_row(fixture)
+    rows = encoder.encode(batch)
+    table = ProbabilityTable(forest, encoder, VALID_TEAMS, VALID_CITIES)
+    matches = load_matches()
+    match_stats = MatchStatsIndex.from_frame(matches)
+
+    results = {
+        'encode_row': time_calls(lambda: encoder.encode_row(fixture), repeat),
+        'encode_batch_100': time_calls(lambda: encoder.encode(batch), repeat),
+        'flat_predict_proba_1': time_calls(lambda: forest.predict_proba(row), repeat),
+        'flat_predict_proba_100': time_calls(lambda: forest.predict_proba(rows), repeat),
+        'sklearn_predict_proba_1': time_calls(lambda: model.predict_proba(row), max(1, repeat // 10)),
+        'sklearn_predict_proba_100': time_calls(lambda: model.predict_proba(rows), max(1, repeat // 10)),
+        'probability_table_lookup': time_calls(lambda: table.lookup(fixture), repeat),
+        'match_stats_lookup': time_calls(lambda: (match_stats.team_stats(fixture['team1']),
+                                                  match_stats.team_stats(fixture['team2']),
+                                                  match_stats.head_to_head(fixture['team1'], fixture['team2'])), repeat),
+        'match_stats_build': time_calls(lambda: MatchStatsIndex.from_frame(matches), max(1, repeat // 20)),
+        'analysis_aggregates_build': time_calls(lambda: AnalysisAggregates.from_frame(matches), max(1, repeat // 20)),
+        'load_matches': time_calls(load_matches, max(1, repeat // 20)),
+    }
+    results.update(_micro_db(batch, max(1, repeat // 4)))
+    return results
+
+
+def _micro_db(fixtures, repeat):
+    """Prediction insert (rows plus summary upsert) against a throwaway SQLite database"""
+    from flask import Flask
+    from models import db
+    from prediction_store import insert_predictions, prediction_row
+
+    tmp_dir = tempfile.mkdtemp(prefix='bench-')
+    try:
+        app = Flask(__name__)
+        app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}"
+        app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        db.init_app(app)
+        with app.app_context():
+            db.create_all()
+            one = lambda: insert_predictions([prediction_row(1, fixtures[0], 0.5)])
+            many = lambda: insert_predictions([prediction_row(1, fixture, 0.5) for fixture in fixtures])
+            results = {
+                'db_insert_1': time_calls(one, repeat),
+                f'db_insert_{len(fixtures)}': time_calls(many, repeat)
+            }
+            db.session.remove()
+            db.engine.dispose()
+        return results
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _request(base_url, method, path, body=None, token=None):
+    data = json.dumps(body).encode('utf-8') if body is not None else None
+    request = urllib.request.Request(base_url + path, data=data, method=method)
+    if data is not None:
+        request.add_header('Content-Type', 'application/json')
+    if token:
+        request.add_header('Authorization', f'Bearer {token}')
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            payload = response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        payload = e.read()
+        status = e.code
+    return time.perf_counter() - started, status, payload
+
+
+def _wait_for(base_url, process, timeout=120):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+        try:
+            if _request(base_url, 'GET', '/health')[1] == 200:
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("Server did not come up")
+
+
+def drive(base_url, method, path, requests, concurrency, make_body=None, token=None):
+    """Send ``requests`` calls from ``concurrency`` threads; latency summary plus throughput"""
+    rng = random.Random(7)
+    bodies = [make_body(rng) if make_body else None for _ in range(requests)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(lambda body: _request(base_url, method, path, body, token), bodies))
+    elapsed = time.perf_counter() - started
+
+    statuses = {}
+    for _, status, _ in outcomes:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    summary = percentiles([latency for latency, _, _ in outcomes])
+    summary.update(throughput=requests / elapsed, elapsed=elapsed, statuses=statuses)
+    return summary
+
+
+def run_load(requests=500, concurrency=8, login_requests=None):
+    tmp_dir = tempfile.mkdtemp(prefix='bench-')
+    port = _free_port()
+    base_url = f'http://127.0.0.1:{port}'
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}")
+    # Measure endpoint latency, not admission control, unless a cap is set explicitly
+    env.setdefault('ADMISSION_MAX_CONCURRENT', '0')
+    env.setdefault('ADMISSION_MAX_WRITES', '0')
+    server = subprocess.Popen([sys.executable, os.path.abspath(__file__), 'serve', '--port', str(port)],
+                              cwd=HERE, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        _wait_for(base_url, server)
+        _, _, payload = _request(base_url, 'POST', '/auth/login', DEFAULT_USER)
+        token = json.loads(payload)['access_token']
+
+        # Password hashing is deliberately slow, so login gets a smaller share
+        login_requests = login_requests or max(concurrency, requests // 10)
+        return {
+            'predict': drive(base_url, 'POST', '/predict', requests, concurrency, random_fixture),
+            'analysis_stats': drive(base_url, 'GET', '/analysis/stats', requests, concurrency),
+            'analysis_real_time': drive(base_url, 'POST', '/analysis/real-time', requests, concurrency,
+                                        random_fixture, token),
+            'auth_login': drive(base_url, 'POST', '/auth/login', login_requests, concurrency,
+                                lambda rng: DEFAULT_USER)
+        }
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def serve(port):
+    """Run the API (with a freshly initialised database) for the load generator"""
+    from werkzeug.serving import make_server
+    from app import create_app, init_database
+
+    app = create_app()
+    init_database(app)
+    make_server('127.0.0.1', port, app, threaded=True).serve_forever()
+
+
+def save(kind, params, results, out=None):
+    report = {'kind': kind, 'params': params, 'environment': environment(), 'results': results}
+    if out is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = report['environment']['timestamp'].replace(':', '').replace('-', '')
+        out = os.path.join(RESULTS_DIR, f'{kind}-{stamp}.json')
+    with open(out, 'w') as f:
+        json.dump(report, f, indent=2)
+    return out
+
+
+def print_results(results):
+    print(f"{'benchmark':<28} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>9}  statuses")
+    for name, summary in results.items():
+        throughput = f"{summary['throughput']:>9.1f}" if 'throughput' in summary else f"{'':>9}"
+        print(f"{name:<28} {summary['p50'] * 1000:>9.3f} {summary['p95'] * 1000:>9.3f} "
+              f"{summary['p99'] * 1000:>9.3f} {throughput}  {summary.get('statuses', '')}")
+
+
+def compare(baseline_path, candidate_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    with open(candidate_path) as f:
+        candidate = json.load(f)
+    print(f"{'benchmark':<28} {'base p50 ms':>12} {'new p50 ms':>12} {'ratio':>8}")
+    for name, summary in candidate['results'].items():
+        if name not in baseline['results']:
+            continue
+        before, after = baseline['results'][name]['p50'], summary['p50']
+        ratio = after / before if before else float('nan')
+        print(f"{name:<28} {before * 1000:>12.3f} {after * 1000:>12.3f} {ratio:>7.2f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backend benchmarks")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    micro = subparsers.add_parser('micro', help="Time encoding, inference, stats and inserts in-process")
+    micro.add_argument('--repeat', type=int, default=200)
+    micro.add_argument('--out')
+    load = subparsers.add_parser('load', help="Drive the API over HTTP and report latency percentiles")
+    load.add_argument('--requests', type=int, default=500)
+    load.add_argument('--concurrency', type=int, default=8)
+    load.add_argument('--out')
+    compare_parser = subparsers.add_parser('compare', help="Compare p50 latencies of two result files")
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('candidate')
+    serve_parser = subparsers.add_parser('serve', help="Serve the API for the load generator")
+    serve_parser.add_argument('--port', type=int, required=True)
+    args = parser.parse_args(argv)
+
+    if args.command == 'micro':
+        results = run_micro(args.repeat)
+        print_results(results)
+        print(f"Saved {save('micro', {'repeat': args.repeat}, results, args.out)}")
+    elif args.command == 'load':
+        results = run_load(args.requests, args.concurrency)
+        print_results(results)
+        params = {'requests': args.requests, 'concurrency': args.concurrency}
+        print(f"Saved {save('load', params, results, args.out)}")
+    elif args.command == 'compare':
+        compare(args.baseline, args.candidate)
+    elif args.command == 'serve':
+        serve(args.port)
+
+
+if __name__ == '__main__':
+    os.chdir(HERE)
+    main()
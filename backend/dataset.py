@@ -0,0 +1,137 @@
+"""Match dataset loading, with a one-time conversion to a columnar binary copy.
+
+    python dataset.py convert [--csv matches.csv] [--out matches_columnar]
+
+The columnar copy keeps one uncompressed .npy file per column (memory-mapped
+on load) plus a meta.json holding the category labels. Team names are already
+canonical and columns nothing reads (umpires, player of the match) are gone.
+"""
+import argparse
+import json
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+from artifacts import META_JSON, artifact_is_current, read_meta, replace_dir, source_signature, warn_if_stale
+from teams import TEAM_COLUMNS, canonicalize_teams
+
+logger = logging.getLogger(__name__)
+
+MATCHES_CSV = 'matches.csv'
+MATCHES_COLUMNAR = 'matches_columnar'
+FORMAT_VERSION = 1
+
+CATEGORICAL_COLUMNS = ['city', 'date', 'team1', 'team2', 'toss_winner', 'toss_decision', 'result', 'winner', 'venue']
+NUMERIC_COLUMNS = ['id', 'season', 'dl_applied', 'win_by_runs', 'win_by_wickets']
+COLUMNS = ['id', 'season', 'city', 'date', 'team1', 'team2', 'toss_winner', 'toss_decision',
+           'result', 'dl_applied', 'winner', 'win_by_runs', 'win_by_wickets', 'venue']
+
+
+def team_dtype(df):
+    """One ordered category set shared by every team column, so they compare directly"""
+    teams = pd.concat([df[column] for column in TEAM_COLUMNS]).dropna().unique()
+    return pd.CategoricalDtype(sorted(teams), ordered=True)
+
+
+def prepare_matches(df):
+    """Canonicalize team names, keep the used columns and convert labels to categoricals"""
+    df = df[[column for column in COLUMNS if column in df.columns]].copy()
+    for column in TEAM_COLUMNS:
+        df[column] = canonicalize_teams(df[column])
+
+    teams = team_dtype(df)
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype(teams if column in TEAM_COLUMNS else 'category')
+    return df
+
+
+def _sources(csv_path):
+    return {'source': csv_path}
+
+
+def convert_csv(csv_path=MATCHES_CSV, out_dir=MATCHES_COLUMNAR):
+    """Write the columnar copy of ``csv_path`` into ``out_dir``, replacing any previous copy"""
+    df = prepare_matches(pd.read_csv(csv_path))
+    # A stray text value would be saved as an object array, which cannot be memory-mapped on load
+    for column in NUMERIC_COLUMNS:
+        if column in df.columns:
+            df[column] = pd.to_numeric(df[column], errors='raise')
+
+    meta = {'format_version': FORMAT_VERSION, 'rows': len(df), 'columns': {}}
+    meta.update(source_signature(_sources(csv_path)))
+
+    with replace_dir(out_dir, prefix='.matches-') as tmp_dir:
+        for column in df.columns:
+            series = df[column]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                codes = series.cat.codes.to_numpy()
+                np.save(os.path.join(tmp_dir, f"{column}.npy"), codes)
+                meta['columns'][column] = {
+                    'kind': 'category',
+                    'categories': [str(c) for c in series.cat.categories],
+                    'ordered': bool(series.cat.ordered)
+                }
+            else:
+                np.save(os.path.join(tmp_dir, f"{column}.npy"), series.to_numpy())
+                meta['columns'][column] = {'kind': 'numeric'}
+        with open(os.path.join(tmp_dir, META_JSON), 'w') as f:
+            json.dump(meta, f)
+
+    logger.info(f"Converted {csv_path} to {out_dir} ({len(df)} rows)")
+    return meta
+
+
+def read_columnar(out_dir=MATCHES_COLUMNAR, mmap=True):
+    meta = read_meta(out_dir)
+    if meta.get('format_version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported columnar format version: {meta.get('format_version')}")
+
+    mmap_mode = 'r' if mmap else None
+    data = {}
+    for column, info in meta['columns'].items():
+        values = np.load(os.path.join(out_dir, f"{column}.npy"), mmap_mode=mmap_mode)
+        if info['kind'] == 'category':
+            dtype = pd.CategoricalDtype(info['categories'], ordered=info['ordered'])
+            data[column] = pd.Categorical.from_codes(values, dtype=dtype)
+        else:
+            data[column] = values
+    return pd.DataFrame(data), meta
+
+
+def columnar_is_current(csv_path=MATCHES_CSV, out_dir=MATCHES_COLUMNAR):
+    """True if the columnar copy exists and was built from the CSV as it is now"""
+    return artifact_is_current(out_dir, _sources(csv_path))
+
+
+def load_matches(csv_path=MATCHES_CSV, out_dir=MATCHES_COLUMNAR, mmap=True):
+    """Load the match history with canonical team names and categorical columns.
+
+    Uses the columnar copy when it matches the CSV, otherwise parses the CSV.
+    """
+    if columnar_is_current(csv_path, out_dir):
+        df, _ = read_columnar(out_dir, mmap=mmap)
+        return df
+
+    warn_if_stale(out_dir, csv_path, 'python dataset.py convert')
+    return prepare_matches(pd.read_csv(csv_path))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="IPL match dataset tools")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    convert = subparsers.add_parser('convert', help="Convert matches.csv to the columnar binary format")
+    convert.add_argument('--csv', default=MATCHES_CSV)
+    convert.add_argument('--out', default=MATCHES_COLUMNAR)
+    args = parser.parse_args(argv)
+
+    if args.command == 'convert':
+        meta = convert_csv(args.csv, args.out)
+        print(f"Wrote {meta['rows']} rows to {args.out}")
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,102 @@
+import numpy as np
+
+FEATURES = ['team1', 'team2', 'toss_winner', 'toss_decision', 'city']
+
+
+class FeatureEncoder:
+    """One-hot encoder that maps each (field, value) straight to a model column index.
+
+    Columns follow pd.get_dummies(drop_first=True) naming (``<field>_<value>``), so
+    the first category of each field has no column and encodes as all zeros.
+    """
+
+    def __init__(self, columns, fields=FEATURES):
+        self.columns = list(columns)
+        self.fields = list(fields)
+        self._index = {}
+
+        # Longest prefix first so one field name can never swallow another
+        prefixes = sorted(((f"{field}_", field) for field in self.fields), key=lambda p: -len(p[0]))
+        for i, column in enumerate(self.columns):
+            for prefix, field in prefixes:
+                if column.startswith(prefix):
+                    self._index[(field, column[len(prefix):])] = i
+                    break
+
+    @classmethod
+    def from_frame(cls, df, fields=FEATURES):
+        """Build the drop_first column layout from training data"""
+        columns = []
+        for field in fields:
+            categories = sorted(df[field].dropna().unique())
+            columns.extend(f"{field}_{value}" for value in categories[1:])
+        return cls(columns, fields)
+
+    @property
+    def n_features(self):
+        return len(self.columns)
+
+    def column_index(self, field, value):
+        """Column for a (field, value) pair, or None for base/unknown categories"""
+        try:
+            return self._index.get((field, value))
+        except TypeError:
+            return None
+
+    def encode_row(self, record, out=None):
+        """Encode one mapping into a (1, n_features) row, reusing ``out`` if given"""
+        if out is None:
+            out = np.zeros((1, self.n_features), dtype=np.float32)
+        else:
+            out.fill(0)
+        for field in self.fields:
+            i = self.column_index(field, record.get(field))
+            if i is not None:
+                out[0, i] = 1
+        return out
+
+    def encode(self, records, out=None):
+        """Encode a sequence of mappings into an (n, n_features) matrix"""
+        if out is None:
+            out = np.zeros((len(records), self.n_features), dtype=np.float32)
+        else:
+            out.fill(0)
+        for row, record in enumerate(records):
+            for field in self.fields:
+                i = self.column_index(field, record.get(field))
+                if i is not None:
+                    out[row, i] = 1
+        return out
+
+    def encode_frame(self, df):
+        """Encode every row of a DataFrame, one vectorized column lookup per field"""
+        out = np.zeros((len(df), self.n_features), dtype=np.float32)
+        rows = np.arange(len(df))
+        for field in self.fields:
+            lookup = {value: i for (f, value), i in self._index.items() if f == field}
+            column = df[field]
+            if hasattr(column, 'cat'):
+                # Resolve each category once, then gather by code (code -1 hits the trailing -1)
+                category_cols = np.array([lookup.get(c, -1) for c in column.cat.categories] + [-1], dtype=np.intp)
+                cols = category_cols[column.cat.codes.to_numpy()]
+            else:
+                cols = column.map(lookup).fillna(-1).to_numpy(dtype=np.intp)
+            hit = cols >= 0
+            out[rows[hit], cols[hit]] = 1
+        return out
+
+
+def check_model_features(model, columns):
+    """Verify a fitted model matches the encoder layout and let it accept plain arrays.
+
+    Models fitted on a DataFrame remember the column names and warn when given
+    ndarrays; once the layout is checked those names carry no extra information.
+    """
+    names = getattr(model, 'feature_names_in_', None)
+    if names is not None:
+        if list(names) != list(columns):
+            raise ValueError("Model features do not match the feature list")
+        del model.feature_names_in_
+    if model.n_features_in_ != len(columns):
+        raise ValueError(f"Model expects {model.n_features_in_} features, got {len(columns)}")
+    return model
@@ -0,0 +1,111 @@
+import numpy as np
+
+
+class FlatForest:
+    """Random forest flattened into contiguous node arrays for fast vectorized inference.
+
+    Every tree's nodes are concatenated into shared arrays, so all trees are
+    walked together one level per step for every input row at once. Leaves
+    point at themselves, which is how they are recognised during traversal.
+    """
+
+    ARRAYS = ['feature', 'threshold', 'left', 'right', 'value', 'roots', 'is_leaf', 'children']
+
+    def __init__(self, feature, threshold, left, right, value, roots, max_depth, classes,
+                 is_leaf=None, children=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.classes_ = np.asarray(classes)
+        # Derived arrays may be passed in (e.g. memory-mapped) instead of rebuilt
+        self.is_leaf = left == np.arange(len(left)) if is_leaf is None else is_leaf
+        # Interleaved (left, right) pairs so one take() picks the next node
+        self.children = np.column_stack([left, right]).ravel() if children is None else children
+        self.n_features_in_ = None
+
+    @classmethod
+    def from_sklearn(cls, model):
+        """Export a fitted RandomForestClassifier (single output) into flat arrays"""
+        if getattr(model, 'n_outputs_', 1) != 1:
+            raise ValueError("Only single-output forests are supported")
+
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            nodes = np.arange(tree.node_count)
+            is_leaf = tree.children_left == -1
+
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(tree.threshold)
+            lefts.append(np.where(is_leaf, nodes, tree.children_left) + offset)
+            rights.append(np.where(is_leaf, nodes, tree.children_right) + offset)
+
+            # Class proportions per node, as DecisionTreeClassifier.predict_proba normalizes them
+            value = tree.value[:, 0, :]
+            totals = value.sum(axis=1, keepdims=True)
+            totals[totals == 0] = 1
+            values.append(value / totals)
+
+            roots.append(offset)
+            offset += tree.node_count
+            max_depth = max(max_depth, tree.max_depth)
+
+        forest = cls(
+            feature=np.ascontiguousarray(np.concatenate(features), dtype=np.intp),
+            threshold=np.ascontiguousarray(np.concatenate(thresholds), dtype=np.float64),
+            left=np.ascontiguousarray(np.concatenate(lefts), dtype=np.intp),
+            right=np.ascontiguousarray(np.concatenate(rights), dtype=np.intp),
+            value=np.ascontiguousarray(np.concatenate(values), dtype=np.float64),
+            roots=np.asarray(roots, dtype=np.intp),
+            max_depth=max_depth,
+            classes=model.classes_
+        )
+        forest.n_features_in_ = model.n_features_in_
+        return forest
+
+    @property
+    def n_estimators(self):
+        return len(self.roots)
+
+    def apply(self, X):
+        """Leaf index reached in every tree, shape (n_samples, n_estimators)"""
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+
+        n_samples, n_trees = X.shape[0], len(self.roots)
+        values = np.ascontiguousarray(X).ravel()
+        node = np.tile(self.roots, n_samples)
+        base = np.repeat(np.arange(n_samples) * X.shape[1], n_trees)
+
+        # Only (sample, tree) pairs still on an internal node take another step
+        active = np.flatnonzero(~self.is_leaf[node])
+        while active.size:
+            current = node[active]
+            go_right = values.take(base.take(active) + self.feature.take(current)) > self.threshold.take(current)
+            current = self.children.take(2 * current + go_right)
+            node[active] = current
+            active = active[~self.is_leaf.take(current)]
+        return node.reshape(n_samples, n_trees)
+
+    def predict_proba(self, X):
+        """Average of per-tree class probabilities, matching RandomForestClassifier.predict_proba"""
+        return self.value[self.apply(X)].mean(axis=1)
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+def check_parity(forest, model, X, atol=1e-9):
+    """Raise if the flat forest disagrees with the sklearn model on X"""
+    expected = model.predict_proba(X)
+    actual = forest.predict_proba(X)
+    if not np.allclose(actual, expected, rtol=0, atol=atol):
+        diff = float(np.max(np.abs(actual - expected)))
+        raise ValueError(f"Flat forest disagrees with model (max abs diff {diff:.3g})")
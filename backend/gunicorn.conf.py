@@ -0,0 +1,13 @@
+import os
+
+bind = os.environ.get('BIND', '0.0.0.0:5010')
+workers = int(os.environ.get('WEB_CONCURRENCY', '4'))
+# Threaded workers, so admission control (ADMISSION_MAX_CONCURRENT defaults to half
+# of these threads) can shed uncached work while cheap answers keep flowing
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', '8'))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '30'))
+
+# Import the app (model, features, match statistics) once in the master and
+# fork workers from it so they share those pages copy-on-write
+preload_app = True
@@ -0,0 +1,79 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from metrics import registry
+from process_local import ProcessLocal
+
+logger = logging.getLogger(__name__)
+
+hash_latency = registry.histogram(
+    'auth_password_hash_seconds', 'Time spent hashing or verifying a password, by operation')
+hash_queue_wait = registry.histogram(
+    'auth_password_hash_queue_wait_seconds', 'Time a password hash waited for a worker')
+hash_rejected = registry.counter(
+    'auth_password_hash_rejected_total', 'Password hashes refused because the pool was saturated, by reason')
+
+
+class HashPoolBusy(Exception):
+    """Raised when a password hash cannot start within the pool's limits"""
+
+    def __init__(self, retry_after):
+        super().__init__("Password hashing pool is saturated")
+        self.retry_after = retry_after
+
+
+class HashPool:
+    """Small dedicated worker pool for CPU-bound password hashing.
+
+    At most ``workers`` hashes run at once and at most ``max_pending`` more may
+    wait. Work that cannot be queued, or that waits longer than
+    ``queue_budget`` seconds before a worker picks it up, fails fast with
+    HashPoolBusy so login storms cannot take over the request workers.
+    """
+
+    def __init__(self, workers=2, max_pending=8, queue_budget=1.0):
+        self.configure(workers, max_pending, queue_budget)
+
+    def configure(self, workers, max_pending, queue_budget):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.queue_budget = queue_budget
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+        self._executor = ProcessLocal(lambda: ThreadPoolExecutor(max_workers=workers,
+                                                                 thread_name_prefix='password-hash'))
+
+    def retry_after(self):
+        return max(1, int(round(self.queue_budget)))
+
+    def run(self, operation, func, *args):
+        """Run ``func(*args)`` on the pool and return its result"""
+        if not self._slots.acquire(blocking=False):
+            hash_rejected.inc(reason='queue_full')
+            raise HashPoolBusy(self.retry_after())
+
+        submitted = time.monotonic()
+
+        def task():
+            waited = time.monotonic() - submitted
+            hash_queue_wait.observe(waited)
+            if waited > self.queue_budget:
+                hash_rejected.inc(reason='queue_budget')
+                raise HashPoolBusy(self.retry_after())
+            started = time.monotonic()
+            try:
+                return func(*args)
+            finally:
+                hash_latency.observe(time.monotonic() - started, operation=operation)
+
+        try:
+            future = self._executor.get().submit(task)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future.result()
+
+
+hash_pool = HashPool()
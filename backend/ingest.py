@@ -0,0 +1,131 @@
+import csv
+import fcntl
+import hashlib
+import io
+import os
+import threading
+
+from teams import TEAM_ALIASES, TEAM_COLUMNS, TEAM_NAME_MAPPINGS
+
+REQUIRED_MATCH_FIELDS = ['season', 'team1', 'team2', 'toss_winner', 'toss_decision', 'venue']
+# Counts stored as non-negative integers (0 when absent)
+NUMERIC_MATCH_FIELDS = ['dl_applied', 'win_by_runs', 'win_by_wickets']
+# Free-text columns written to the CSV as given: each must be a one-line string or absent
+STRING_MATCH_FIELDS = ['city', 'date', 'result', 'player_of_match', 'venue', 'umpire1', 'umpire2', 'umpire3']
+
+
+def _count(value):
+    """Non-negative int from a JSON number or numeric string; absent counts as 0, anything else raises ValueError"""
+    if value is None or value == '':
+        return 0
+    if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+        raise ValueError(value)
+    number = int(value)
+    if number < 0:
+        raise ValueError(value)
+    return number
+
+
+def normalize_match(data):
+    """Validate one incoming match result and canonicalize its team names.
+
+    Returns (row, error); exactly one of them is None.
+    """
+    if not isinstance(data, dict):
+        return None, "Match must be a JSON object"
+    for field in REQUIRED_MATCH_FIELDS:
+        if field not in data or data[field] in (None, ''):
+            return None, f"Missing required field: {field}"
+    for field in STRING_MATCH_FIELDS:
+        value = data.get(field)
+        if value is not None and (not isinstance(value, str) or '\n' in value or '\r' in value):
+            return None, f"Invalid {field}: must be a single-line string"
+
+    row = dict(data)
+    for column in TEAM_COLUMNS:
+        if row.get(column):
+            # Only current franchises (or their historical names) can play new matches
+            current_name = TEAM_ALIASES.get(row[column]) if isinstance(row[column], str) else None
+            if current_name not in TEAM_NAME_MAPPINGS:
+                return None, f"Unknown team in {column}: {row[column]}"
+            row[column] = current_name
+        else:
+            row[column] = None
+
+    try:
+        row['season'] = int(row['season'])
+    except (TypeError, ValueError):
+        return None, f"Invalid season: {data['season']}"
+    if row['team1'] == row['team2']:
+        return None, "Team1 and Team2 cannot be the same"
+    if row['toss_winner'] not in [row['team1'], row['team2']]:
+        return None, "Toss winner must be one of the playing teams"
+    if row['winner'] is not None and row['winner'] not in [row['team1'], row['team2']]:
+        return None, "Winner must be one of the playing teams"
+    if row['toss_decision'] not in ['bat', 'field']:
+        return None, "Toss decision must be either 'bat' or 'field'"
+
+    for column in NUMERIC_MATCH_FIELDS:
+        try:
+            row[column] = _count(row.get(column))
+        except (TypeError, ValueError):
+            return None, f"Invalid {column}: must be a non-negative integer"
+
+    row.setdefault('result', 'normal' if row['winner'] else 'no result')
+    return row, None
+
+
+class MatchLog:
+    """Append-only writer for the match CSV that assigns match ids.
+
+    Every append holds an exclusive ``flock`` on the file, so workers in other
+    processes serialize with it. Ids continue from the last row on disk, read
+    under that lock, so a process never reuses an id another one assigned.
+    """
+
+    def __init__(self, path, next_id):
+        self.path = path
+        self.next_id = int(next_id)
+        self._lock = threading.Lock()
+        with open(path, newline='') as f:
+            self.columns = next(csv.reader(f))
+
+    def _last_id(self, f, tail_size=65536):
+        """Id of the last row in the file, or None"""
+        size = f.seek(0, os.SEEK_END)
+        f.seek(max(0, size - tail_size))
+        lines = [line for line in f.read().decode('utf-8', errors='replace').splitlines() if line.strip()]
+        try:
+            return int(next(csv.reader([lines[-1]]))[self.columns.index('id')])
+        except (IndexError, ValueError):
+            return None  # empty, or only the header
+
+    def append(self, rows):
+        """Append rows (ids are assigned in place) and return a digest of the bytes written"""
+        with self._lock, open(self.path, 'a+b') as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                last_id = self._last_id(f)
+                if last_id is not None:
+                    self.next_id = max(self.next_id, last_id + 1)
+                for row in rows:
+                    row['id'] = self.next_id
+                    self.next_id += 1
+
+                buffer = io.StringIO()
+                writer = csv.DictWriter(buffer, fieldnames=self.columns, extrasaction='ignore', lineterminator='\n')
+                writer.writerows({column: ('' if row.get(column) is None else row[column]) for column in self.columns}
+                                 for row in rows)
+                payload = buffer.getvalue()
+
+                # Opened for append: the write lands at the end of the file whatever was read
+                if f.tell() > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b'\n':
+                        payload = '\n' + payload
+                f.write(payload.encode('utf-8'))
+                f.flush()
+                os.fsync(f.fileno())
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            return hashlib.sha256(payload.encode('utf-8')).hexdigest()
@@ -1,11 +1,10 @@
-from app import app, db
-from models import User, Prediction
+from app import create_app, init_database
 
 def init_db():
-    with app.app_context():
-        # Create all tables
-        db.create_all()
-        print("Database tables created successfully!")
+    # Create all tables, indexes and the default test account
+    # Schema only: skip loading the model and match statistics, which the server does itself
+    init_database(create_app({'PRELOAD_MODEL': False, 'MODEL_RELOAD_INTERVAL': 0}))
+    print("Database tables created successfully!")
 
 if __name__ == '__main__':
-    init_db() 
\ No newline at end of file
+    init_db()
\ No newline at end of file
@@ -15,39 +15,16 @@ from sklearn.metrics import classification_report, confusion_matrix
 import seaborn as sns
 import matplotlib.pyplot as plt
 import joblib
+from encoder import FEATURES, FeatureEncoder
+from teams import get_canonical_team_name
+from dataset import load_matches
+from model_store import MODEL_PKL, FEATURES_PKL, export_pickle, load_model
 
-# Team name mappings
-TEAM_NAME_MAPPINGS = {
-    "Delhi Capitals": ["Delhi Daredevils", "Delhi Capitals"],
-    "Punjab Kings": ["Kings XI Punjab", "Punjab Kings"],
-    "Mumbai Indians": ["Mumbai Indians"],
-    "Chennai Super Kings": ["Chennai Super Kings"],
-    "Kolkata Knight Riders": ["Kolkata Knight Riders"],
-    "Rajasthan Royals": ["Rajasthan Royals"],
-    "Royal Challengers Bangalore": ["Royal Challengers Bangalore"],
-    "Sunrisers Hyderabad": ["Sunrisers Hyderabad"],
-    "Lucknow Super Giants": ["Lucknow Super Giants"],
-    "Gujarat Titans": ["Gujarat Titans"]
-}
-
-def get_canonical_team_name(team_name):
-    """Convert historical team names to their current names"""
-    for current_name, historical_names in TEAM_NAME_MAPPINGS.items():
-        if team_name in historical_names:
-            return current_name
-    return team_name
-
-# Load the dataset
-file = pd.read_csv('matches.csv')
-
-# Convert historical team names to current names
-file['team1'] = file['team1'].apply(get_canonical_team_name)
-file['team2'] = file['team2'].apply(get_canonical_team_name)
-file['toss_winner'] = file['toss_winner'].apply(get_canonical_team_name)
-file['winner'] = file['winner'].apply(get_canonical_team_name)
+# Load the dataset (columnar copy when available) with current team names
+file = load_matches()
 
 # Drop irrelevant columns
-file = file.drop(['umpire1', 'umpire2', 'date', 'dl_applied', 'id', 'venue'], axis=1)
+file = file.drop(['umpire1', 'umpire2', 'date', 'dl_applied', 'id', 'venue'], axis=1, errors='ignore')
 
 # Remove rows with missing 'winner' (match not played or abandoned)
 file = file.dropna(subset=['winner'])
@@ -55,9 +32,9 @@ file = file.dropna(subset=['winner'])
 # Binary classification: 1 if toss winner = match winner, else 0
 file['target'] = (file['toss_winner'] == file['winner']).astype(int)
 
-# Select features
-features = ['team1', 'team2', 'toss_winner', 'toss_decision', 'city']
-X = pd.get_dummies(file[features], drop_first=True)
+# Select features and build the shared encoder from the training data
+encoder = FeatureEncoder.from_frame(file, FEATURES)
+X = encoder.encode_frame(file)
 y = file['target']
 
 X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
@@ -82,23 +59,21 @@ def predict_toss_win_effect(team1, team2, toss_winner, toss_decision, city):
     team2 = get_canonical_team_name(team2)
     toss_winner = get_canonical_team_name(toss_winner)
     
-    input_df = pd.DataFrame({
-        'team1': [team1],
-        'team2': [team2],
-        'toss_winner': [toss_winner],
-        'toss_decision': [toss_decision],
-        'city': [city]
+    input_encoded = encoder.encode_row({
+        'team1': team1,
+        'team2': team2,
+        'toss_winner': toss_winner,
+        'toss_decision': toss_decision,
+        'city': city
     })
 
-    input_encoded = pd.get_dummies(input_df, drop_first=True)
-    input_encoded = input_encoded.reindex(columns=X.columns, fill_value=0)
-
     pred = model.predict_proba(input_encoded)[0][1]
     return f"Probability of Toss Winner also winning the match: {pred:.2f}"
 
-# Save the model and features
-joblib.dump(model, 'ipl_toss_win_model.pkl')
-joblib.dump(X.columns.tolist(), 'model_features.pkl')
+# Save the model and features, plus the memory-mappable copy the API loads
+joblib.dump(model, MODEL_PKL)
+joblib.dump(encoder.columns, FEATURES_PKL)
+export_pickle(MODEL_PKL, FEATURES_PKL)
 
 # Create new column: did toss winner win the match?
 file['toss_win_match_win'] = (file['toss_winner'] == file['winner']).astype(int)
@@ -137,7 +112,7 @@ plt.tight_layout()
 plt.show()
 
 importances = model.feature_importances_
-features_list = X.columns
+features_list = encoder.columns
 
 # Create a DataFrame for better plotting
 feat_imp_df = pd.DataFrame({'Feature': features_list, 'Importance': importances})
@@ -188,20 +163,17 @@ best_pred = best_model.predict(X_test)
 print("Tuned Random Forest Accuracy:", best_model.score(X_test, y_test))
 
 def predict_saved_model(team1, team2, toss_winner, toss_decision, city):
-    model = joblib.load('ipl_toss_win_model.pkl')
-    model_cols = joblib.load('model_features.pkl')
-
-    df = pd.DataFrame({
-        'team1': [team1],
-        'team2': [team2],
-        'toss_winner': [toss_winner],
-        'toss_decision': [toss_decision],
-        'city': [city]
+    model, model_cols = load_model()
+    encoder = FeatureEncoder(model_cols)
+
+    df_encoded = encoder.encode_row({
+        'team1': team1,
+        'team2': team2,
+        'toss_winner': toss_winner,
+        'toss_decision': toss_decision,
+        'city': city
     })
 
-    df_encoded = pd.get_dummies(df, drop_first=True)
-    df_encoded = df_encoded.reindex(columns=model_cols, fill_value=0)
-
     prob = model.predict_proba(df_encoded)[0][1]
     return f"Predicted Probability (Toss winner also wins match): {prob:.2f}"
 
@@ -0,0 +1,55 @@
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+from metrics import registry
+from process_local import ProcessLocal
+
+log_records_dropped = registry.counter(
+    'log_records_dropped_total', 'Log records dropped because the logging queue was full')
+
+
+class ProcessQueueHandler(QueueHandler):
+    """Hands records to a background listener that writes them to the real handlers.
+
+    Request threads only format the record and put it on a bounded queue; file
+    and console I/O happen on the listener thread, which each process starts
+    on first use. When the queue is full records are dropped (and counted)
+    rather than blocking the caller.
+    """
+
+    def __init__(self, handlers, max_queue=10000):
+        super().__init__(queue.Queue(maxsize=max_queue))
+        self.targets = list(handlers)
+        self.max_queue = max_queue
+        self._listener = ProcessLocal(self._start_listener)
+
+    def _start_listener(self):
+        # Records queued by the parent belong to the parent's listener
+        self.queue = queue.Queue(maxsize=self.max_queue)
+        listener = QueueListener(self.queue, *self.targets, respect_handler_level=True)
+        listener.start()
+        return listener
+
+    def enqueue(self, record):
+        self._listener.get()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            log_records_dropped.inc()
+
+    def close(self):
+        # Drain what is queued before the target handlers are closed
+        listener = self._listener.pop()
+        if listener is not None:
+            listener.stop()
+        super().close()
+
+
+def configure_logging(path='app.log', level=logging.INFO,
+                      format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'):
+    """Log to ``path`` and the console through a ProcessQueueHandler"""
+    handler = ProcessQueueHandler([logging.FileHandler(path), logging.StreamHandler()])
+    handler.setFormatter(logging.Formatter(format))
+    logging.basicConfig(level=level, handlers=[handler])
+    return handler
@@ -0,0 +1,99 @@
+import copy
+
+import numpy as np
+
+from season_counts import SeasonCounts
+
+
+def pair_key(team1, team2):
+    """Order-independent key for a head-to-head pairing"""
+    return (team1, team2) if team1 <= team2 else (team2, team1)
+
+
+class MatchStatsIndex:
+    """Per-team and head-to-head counters over the match history, built once.
+
+    Answers the same questions as filtering matches.csv per request, but as
+    counter reads: matches played, toss wins and match wins per team, and per
+    pairing the number of meetings and each side's match and toss wins. The
+    counters are running totals by season, so any season range costs the same.
+    """
+
+    def __init__(self, seasons=()):
+        self.matches = SeasonCounts(seasons)
+        self.toss_wins = SeasonCounts(seasons)
+        self.match_wins = SeasonCounts(seasons)
+        self.h2h_matches = SeasonCounts(seasons)
+        self.h2h_wins = SeasonCounts(seasons)
+        self.h2h_toss_wins = SeasonCounts(seasons)
+
+    @classmethod
+    def from_frame(cls, df):
+        def count(frame, *columns):
+            return frame.groupby(['season', *columns], observed=True).size()
+
+        seasons = df['season'].unique().tolist()
+        index = cls()
+        index.matches = SeasonCounts.from_counts(seasons, count(df, 'team1'), count(df, 'team2'))
+        index.toss_wins = SeasonCounts.from_counts(seasons, count(df, 'toss_winner'))
+        index.match_wins = SeasonCounts.from_counts(seasons, count(df, 'winner'))
+
+        # Head-to-head counters keyed by the sorted pairing
+        first = np.where(df['team1'] <= df['team2'], df['team1'], df['team2'])
+        second = np.where(df['team1'] <= df['team2'], df['team2'], df['team1'])
+        pairs = df.assign(pair_first=first, pair_second=second)
+
+        index.h2h_matches = SeasonCounts.from_counts(seasons, count(pairs, 'pair_first', 'pair_second'))
+        index.h2h_wins = SeasonCounts.from_counts(seasons, count(pairs, 'pair_first', 'pair_second', 'winner'))
+        index.h2h_toss_wins = SeasonCounts.from_counts(seasons, count(pairs, 'pair_first', 'pair_second', 'toss_winner'))
+        return index
+
+    def with_matches(self, rows):
+        """Copy of the index with new matches applied; readers of this one are unaffected.
+
+        Only the rows of the keys the matches touch are copied (every row when
+        a match opens a new season).
+        """
+        updated = copy.copy(self)
+        for name, counts in vars(self).items():
+            setattr(updated, name, counts.copy())
+        for row in rows:
+            updated._add_match(row)
+        return updated
+
+    def _add_match(self, row):
+        season, team1, team2 = row['season'], row['team1'], row['team2']
+        toss_winner, winner = row.get('toss_winner'), row.get('winner')
+        pair = pair_key(team1, team2)
+
+        self.matches.add(season, team1)
+        self.matches.add(season, team2)
+        self.h2h_matches.add(season, pair)
+        if toss_winner:
+            self.toss_wins.add(season, toss_winner)
+            self.h2h_toss_wins.add(season, pair + (toss_winner,))
+        if winner:
+            self.match_wins.add(season, winner)
+            self.h2h_wins.add(season, pair + (winner,))
+
+    def team_stats(self, team, season_from=None, season_to=None):
+        seasons = (season_from, season_to)
+        total_matches = self.matches.get(team, *seasons)
+        match_wins = self.match_wins.get(team, *seasons)
+        return {
+            'total_matches': total_matches,
+            'toss_wins': self.toss_wins.get(team, *seasons),
+            'match_wins': match_wins,
+            'win_rate': match_wins / total_matches if total_matches > 0 else 0
+        }
+
+    def head_to_head(self, team1, team2, season_from=None, season_to=None):
+        seasons = (season_from, season_to)
+        pair = pair_key(team1, team2)
+        return {
+            'total_matches': self.h2h_matches.get(pair, *seasons),
+            'team1_wins': self.h2h_wins.get(pair + (team1,), *seasons),
+            'team2_wins': self.h2h_wins.get(pair + (team2,), *seasons),
+            'team1_toss_wins': self.h2h_toss_wins.get(pair + (team1,), *seasons),
+            'team2_toss_wins': self.h2h_toss_wins.get(pair + (team2,), *seasons)
+        }
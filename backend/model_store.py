@@ -0,0 +1,221 @@
+"""Model artifacts, with a one-time export of the forest to memory-mappable arrays.
+
+    python model_store.py export [--model ipl_toss_win_model.pkl] [--features model_features.pkl] [--out model_flat]
+    python model_store.py benchmark [--repeat 5]
+
+The flat copy keeps every FlatForest array as an uncompressed .npy file plus a
+meta.json holding the feature columns and classes. Loading it maps the files
+instead of unpickling the forest, so it costs a few page-table entries and the
+pages are shared by every process that maps them.
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from artifacts import META_JSON, artifact_is_current, read_meta, replace_dir, source_signature, warn_if_stale
+from dataset_cache import file_digest
+from forest import FlatForest, check_parity
+
+logger = logging.getLogger(__name__)
+
+MODEL_PKL = 'ipl_toss_win_model.pkl'
+FEATURES_PKL = 'model_features.pkl'
+MODEL_FLAT = 'model_flat'
+FORMAT_VERSION = 1
+
+
+def _sources(model_path, features_path):
+    return {'model': model_path, 'features': features_path}
+
+
+def _parity_probe(n_features):
+    return np.vstack([np.zeros((1, n_features)), np.eye(n_features)])
+
+
+def load_pickle(model_path=MODEL_PKL, features_path=FEATURES_PKL):
+    """Unpickle the sklearn model and its feature columns"""
+    import joblib
+    from encoder import check_model_features
+
+    model = joblib.load(model_path)
+    columns = joblib.load(features_path)
+    check_model_features(model, columns)
+    return model, list(columns)
+
+
+def export_model(model, columns, out_dir=MODEL_FLAT, source=None):
+    """Write the flat copy of a fitted forest into ``out_dir``, replacing any previous copy"""
+    forest = FlatForest.from_sklearn(model)
+    check_parity(forest, model, _parity_probe(len(columns)))
+
+    meta = {
+        'format_version': FORMAT_VERSION,
+        'columns': list(columns),
+        'classes': np.asarray(forest.classes_).tolist(),
+        'max_depth': forest.max_depth,
+        'n_features_in': int(forest.n_features_in_),
+        'nodes': len(forest.left)
+    }
+    meta.update(source or {})
+
+    with replace_dir(out_dir, prefix='.model-') as tmp_dir:
+        for name in FlatForest.ARRAYS:
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), np.ascontiguousarray(getattr(forest, name)))
+        with open(os.path.join(tmp_dir, META_JSON), 'w') as f:
+            json.dump(meta, f)
+
+    logger.info(f"Exported {forest.n_estimators} trees ({meta['nodes']} nodes) to {out_dir}")
+    return meta
+
+
+def export_pickle(model_path=MODEL_PKL, features_path=FEATURES_PKL, out_dir=MODEL_FLAT):
+    model, columns = load_pickle(model_path, features_path)
+    return export_model(model, columns, out_dir, source=source_signature(_sources(model_path, features_path)))
+
+
+def read_flat_model(out_dir=MODEL_FLAT, mmap=True):
+    """Return (FlatForest, feature columns) from the flat copy"""
+    meta = read_meta(out_dir)
+    if meta.get('format_version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported model format version: {meta.get('format_version')}")
+
+    mmap_mode = 'r' if mmap else None
+    # Plain ndarray views of the maps: same pages, without np.memmap's per-operation overhead
+    arrays = {name: np.load(os.path.join(out_dir, f"{name}.npy"), mmap_mode=mmap_mode).view(np.ndarray)
+              for name in FlatForest.ARRAYS}
+    forest = FlatForest(max_depth=meta['max_depth'], classes=meta['classes'], **arrays)
+    forest.n_features_in_ = meta['n_features_in']
+    return forest, meta['columns']
+
+
+def flat_model_is_current(model_path=MODEL_PKL, features_path=FEATURES_PKL, out_dir=MODEL_FLAT):
+    """True if the flat copy exists and was exported from the pickles as they are now"""
+    return artifact_is_current(out_dir, _sources(model_path, features_path))
+
+
+def model_version(model_path=MODEL_PKL, features_path=FEATURES_PKL, out_dir=MODEL_FLAT):
+    """Short content hash of the model artifacts, reported with every prediction"""
+    paths = [path for path in (model_path, features_path) if os.path.exists(path)]
+    if not paths:
+        paths = [os.path.join(out_dir, META_JSON)]
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(file_digest(path).encode())
+    return digest.hexdigest()[:12]
+
+
+def load_model(engine='flat', model_path=MODEL_PKL, features_path=FEATURES_PKL, out_dir=MODEL_FLAT, mmap=True):
+    """Return (predictor, feature columns) for the requested inference engine.
+
+    The flat engine maps the exported arrays when they match the pickles.
+    Otherwise the pickle is loaded; the flat engine then rebuilds the forest in
+    memory and falls back to sklearn if the rebuild disagrees with it.
+    """
+    if engine == 'flat' and out_dir and flat_model_is_current(model_path, features_path, out_dir):
+        forest, columns = read_flat_model(out_dir, mmap=mmap)
+        logger.info(f"Loaded flat model from {out_dir} ({forest.n_estimators} trees)")
+        return forest, columns
+
+    if engine == 'flat' and out_dir:
+        warn_if_stale(out_dir, model_path, 'python model_store.py export')
+    model, columns = load_pickle(model_path, features_path)
+    if engine != 'flat':
+        return model, columns
+
+    try:
+        forest = FlatForest.from_sklearn(model)
+        check_parity(forest, model, _parity_probe(len(columns)))
+        return forest, columns
+    except Exception as e:
+        logger.error(f"Error building flat forest, falling back to sklearn: {str(e)}")
+        return model, columns
+
+
+def _memory_kb():
+    """Resident and private (not shared with other processes) memory of this process in kB"""
+    usage = {}
+    for path, keys in (('/proc/self/status', ('VmRSS',)),
+                       ('/proc/self/smaps_rollup', ('Private_Clean', 'Private_Dirty'))):
+        try:
+            with open(path) as f:
+                for line in f:
+                    key, _, value = line.partition(':')
+                    if key in keys:
+                        usage[key] = int(value.split()[0])
+        except OSError:
+            pass
+    return {'rss_kb': usage.get('VmRSS'),
+            'private_kb': usage['Private_Clean'] + usage['Private_Dirty'] if 'Private_Clean' in usage else None}
+
+
+def measure(source):
+    """Load the model the way the API does (plus one prediction) and report time and memory"""
+    baseline = _memory_kb()
+    started = time.perf_counter()
+    predictor, columns = load_model(out_dir=MODEL_FLAT if source == 'flat' else None)
+    predictor.predict_proba(np.zeros((1, len(columns)), dtype=np.float32))
+    elapsed = time.perf_counter() - started
+    after = _memory_kb()
+    return {
+        'source': source,
+        'load_seconds': elapsed,
+        'rss_kb': after['rss_kb'],
+        'rss_growth_kb': after['rss_kb'] - baseline['rss_kb'] if after['rss_kb'] and baseline['rss_kb'] else None,
+        'private_growth_kb': after['private_kb'] - baseline['private_kb'] if after['private_kb'] and baseline['private_kb'] else None
+    }
+
+
+def benchmark(repeat=5):
+    """Cold-start each source in fresh interpreters; returns the median run per source"""
+    results = {}
+    for source in ('pickle', 'flat'):
+        runs = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            output = subprocess.run([sys.executable, os.path.abspath(__file__), 'measure', source],
+                                    capture_output=True, text=True, check=True).stdout
+            run = json.loads(output.strip().splitlines()[-1])
+            run['process_seconds'] = time.perf_counter() - started
+            runs.append(run)
+        runs.sort(key=lambda run: run['process_seconds'])
+        results[source] = runs[len(runs) // 2]
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="IPL model artifact tools")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    export = subparsers.add_parser('export', help="Export the pickled model to the flat memory-mappable format")
+    export.add_argument('--model', default=MODEL_PKL)
+    export.add_argument('--features', default=FEATURES_PKL)
+    export.add_argument('--out', default=MODEL_FLAT)
+    bench = subparsers.add_parser('benchmark', help="Compare cold-start time and memory of both formats")
+    bench.add_argument('--repeat', type=int, default=5)
+    measure_parser = subparsers.add_parser('measure', help="Load once and print timings as JSON")
+    measure_parser.add_argument('source', choices=['pickle', 'flat'])
+    args = parser.parse_args(argv)
+
+    if args.command == 'export':
+        meta = export_pickle(args.model, args.features, args.out)
+        print(f"Wrote {meta['nodes']} nodes to {args.out}")
+    elif args.command == 'measure':
+        print(json.dumps(measure(args.source)))
+    elif args.command == 'benchmark':
+        results = benchmark(args.repeat)
+        print(f"{'source':<8} {'process s':>10} {'load s':>8} {'rss MB':>8} {'+rss MB':>8} {'+private MB':>12}")
+        for source, run in results.items():
+            private = run['private_growth_kb'] / 1024 if run['private_growth_kb'] is not None else float('nan')
+            print(f"{source:<8} {run['process_seconds']:>10.3f} {run['load_seconds']:>8.3f} "
+                  f"{run['rss_kb'] / 1024:>8.1f} {run['rss_growth_kb'] / 1024:>8.1f} {private:>12.1f}")
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    main()
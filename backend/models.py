@@ -25,6 +25,11 @@ class Prediction(db.Model):
     predicted_probability = db.Column(db.Float, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # Serves keyset pagination of a user's history, newest first
+    __table_args__ = (
+        db.Index('ix_prediction_user_created_id', 'user_id', 'created_at', 'id'),
+    )
+
     def __repr__(self):
         return f'<Prediction {self.id}>'
 
@@ -38,4 +43,24 @@ class Prediction(db.Model):
             'city': self.city,
             'predicted_probability': self.predicted_probability,
             'created_at': self.created_at.isoformat()
-        } 
\ No newline at end of file
+        }
+
+class PredictionSummary(db.Model):
+    """Running per-user totals by team pairing and city, kept in step with Prediction inserts"""
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    team_a = db.Column(db.String(100), primary_key=True)  # alphabetically first team of the pair
+    team_b = db.Column(db.String(100), primary_key=True)
+    city = db.Column(db.String(100), primary_key=True)
+    predictions = db.Column(db.Integer, nullable=False, default=0)
+    probability_sum = db.Column(db.Float, nullable=False, default=0.0)
+    team_a_toss_wins = db.Column(db.Integer, nullable=False, default=0)
+    team_b_toss_wins = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<PredictionSummary {self.user_id} {self.team_a}/{self.team_b} {self.city}>'
+
+def ensure_indexes():
+    """Create indexes added to existing tables after they were first created"""
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(db.engine, checkfirst=True)
@@ -0,0 +1,221 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+from datetime import datetime
+
+from metrics import registry
+from models import db, Prediction, PredictionSummary
+from process_local import ProcessLocal
+
+logger = logging.getLogger(__name__)
+
+PREDICTION_FIELDS = ['team1', 'team2', 'toss_winner', 'toss_decision', 'city']
+
+write_behind_flushed = registry.counter(
+    'prediction_write_behind_flushed_total', 'Predictions written by the write-behind worker')
+write_behind_dropped = registry.counter(
+    'prediction_write_behind_dropped_total', 'Predictions dropped by the write-behind worker, by reason')
+
+
+def prediction_row(user_id, data, prob):
+    """Insert parameters for one Prediction, stamped with the request time"""
+    row = {field: data[field] for field in PREDICTION_FIELDS}
+    row.update(user_id=user_id, predicted_probability=float(prob), created_at=datetime.utcnow())
+    return row
+
+
+def summary_deltas(rows):
+    """Collapse prediction rows into per-(user, team pair, city) summary increments"""
+    deltas = {}
+    for row in rows:
+        team_a, team_b = sorted([row['team1'], row['team2']])
+        key = (row['user_id'], team_a, team_b, row['city'])
+        delta = deltas.setdefault(key, {
+            'user_id': key[0], 'team_a': team_a, 'team_b': team_b, 'city': key[3],
+            'predictions': 0, 'probability_sum': 0.0, 'team_a_toss_wins': 0, 'team_b_toss_wins': 0
+        })
+        delta['predictions'] += 1
+        delta['probability_sum'] += row['predicted_probability']
+        delta['team_a_toss_wins'] += int(row['toss_winner'] == team_a)
+        delta['team_b_toss_wins'] += int(row['toss_winner'] == team_b)
+    return list(deltas.values())
+
+
+SUMMARY_COUNTERS = ['predictions', 'probability_sum', 'team_a_toss_wins', 'team_b_toss_wins']
+
+
+def apply_summary_deltas(deltas):
+    """Add deltas to PredictionSummary rows, creating them as needed (in the current transaction)"""
+    if not deltas:
+        return
+    dialect = db.engine.dialect.name
+    if dialect in ('postgresql', 'sqlite'):
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        statement = insert(PredictionSummary)
+        statement = statement.on_conflict_do_update(
+            index_elements=['user_id', 'team_a', 'team_b', 'city'],
+            set_={column: getattr(PredictionSummary, column) + getattr(statement.excluded, column)
+                  for column in SUMMARY_COUNTERS}
+        )
+        db.session.execute(statement, deltas)
+        return
+
+    # Portable fallback: read-modify-write per key
+    for delta in deltas:
+        summary = db.session.get(PredictionSummary, (delta['user_id'], delta['team_a'], delta['team_b'], delta['city']))
+        if summary is None:
+            db.session.add(PredictionSummary(**delta))
+        else:
+            for column in SUMMARY_COUNTERS:
+                setattr(summary, column, getattr(summary, column) + delta[column])
+
+
+def rebuild_prediction_summaries():
+    """Recompute every PredictionSummary row from Prediction with one GROUP BY"""
+    team_a = db.case((Prediction.team1 <= Prediction.team2, Prediction.team1), else_=Prediction.team2)
+    team_b = db.case((Prediction.team1 <= Prediction.team2, Prediction.team2), else_=Prediction.team1)
+    query = db.select(
+        Prediction.user_id, team_a, team_b, Prediction.city,
+        db.func.count(),
+        db.func.sum(Prediction.predicted_probability),
+        db.func.sum(db.case((Prediction.toss_winner == team_a, 1), else_=0)),
+        db.func.sum(db.case((Prediction.toss_winner == team_b, 1), else_=0))
+    ).group_by(Prediction.user_id, team_a, team_b, Prediction.city)
+
+    columns = ['user_id', 'team_a', 'team_b', 'city'] + SUMMARY_COUNTERS
+    summaries = [dict(zip(columns, row)) for row in db.session.execute(query)]
+    try:
+        db.session.execute(db.delete(PredictionSummary))
+        if summaries:
+            db.session.execute(db.insert(PredictionSummary), summaries)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    logger.info(f"Rebuilt {len(summaries)} prediction summaries")
+
+
+def ensure_prediction_summaries():
+    """Backfill summaries for databases that predate the summary table"""
+    has_predictions = db.session.execute(db.select(Prediction.id).limit(1)).first() is not None
+    has_summaries = db.session.execute(db.select(PredictionSummary.user_id).limit(1)).first() is not None
+    if has_predictions and not has_summaries:
+        rebuild_prediction_summaries()
+
+
+def insert_predictions(rows):
+    """Save prediction rows with one bulk INSERT, update their summaries and commit"""
+    if not rows:
+        return
+    try:
+        db.session.execute(db.insert(Prediction), rows)
+        apply_summary_deltas(summary_deltas(rows))
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+
+_STOP = object()  # queued by close(): flush what is batched and exit
+
+
+class PredictionWriter:
+    """Bounded in-process queue of predictions flushed by a background thread.
+
+    Rows are written in bulk when ``batch_size`` rows are waiting or
+    ``flush_interval`` seconds have passed since the first one arrived. When the
+    queue is full new rows are dropped (and counted) rather than blocking the
+    request. Remaining rows are flushed when the process exits.
+    """
+
+    def __init__(self, app, max_queue=10000, batch_size=200, flush_interval=0.5):
+        self.app = app
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = ProcessLocal(self._start)
+        registry.gauge('prediction_write_behind_queue_depth',
+                       'Predictions waiting in the write-behind queue', self._queue.qsize)
+        atexit.register(self.close)
+
+    def _start(self):
+        thread = threading.Thread(target=self._run, name='prediction-writer', daemon=True)
+        thread.start()
+        return thread
+
+    def submit(self, row):
+        """Queue a row for writing; returns False if it had to be dropped"""
+        self._thread.get()
+        try:
+            self._queue.put_nowait(row)
+            return True
+        except queue.Full:
+            write_behind_dropped.inc(reason='queue_full')
+            logger.warning("Write-behind queue full, dropping prediction")
+            return False
+
+    def _next_batch(self):
+        """(rows, stopping): up to batch_size rows, cut short by the flush deadline or close()"""
+        try:
+            item = self._queue.get(timeout=self.flush_interval)
+        except queue.Empty:
+            return [], False
+        if item is _STOP:
+            return [], True
+        batch = [item]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _flush(self, batch):
+        if not batch:
+            return
+        try:
+            with self.app.app_context():
+                insert_predictions(batch)
+            write_behind_flushed.inc(len(batch))
+        except Exception as e:
+            write_behind_dropped.inc(len(batch), reason='write_error')
+            logger.error(f"Error flushing {len(batch)} predictions: {str(e)}")
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch, stopping = self._next_batch()
+            self._flush(batch)
+
+    def _drain(self):
+        batch = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                batch.append(item)
+        for start in range(0, len(batch), self.batch_size):
+            self._flush(batch[start:start + self.batch_size])
+
+    def close(self):
+        """Stop the worker once it has written the batch it holds, then write everything still queued"""
+        thread = self._thread.current()
+        if thread is not None and thread.is_alive():
+            # Blocks only while the queue is full, which the worker is draining
+            self._queue.put(_STOP)
+            thread.join()
+        self._drain()
@@ -0,0 +1,239 @@
+import base64
+import csv
+import io
+import json
+from datetime import datetime, timedelta, timezone
+
+from flask import Blueprint, current_app, request, jsonify, stream_with_context
+from flask_jwt_extended import jwt_required
+from auth import current_user_id
+from models import db, Prediction
+from teams import get_canonical_team_name
+
+predictions = Blueprint('predictions', __name__)
+
+HISTORY_FIELDS = ['id', 'team1', 'team2', 'toss_winner', 'toss_decision', 'city',
+                  'predicted_probability', 'created_at']
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+EXPORT_FORMATS = {'csv': 'text/csv', 'ndjson': 'application/x-ndjson'}
+
+
+def encode_cursor(created_at, prediction_id):
+    raw = json.dumps([created_at.isoformat(), prediction_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def decode_cursor(cursor):
+    created_at, prediction_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    return datetime.fromisoformat(created_at), int(prediction_id)
+
+
+def serialize_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+@predictions.route('/history', methods=['GET'])
+@jwt_required()
+def history():
+    try:
+        user_id = current_user_id()
+
+        try:
+            limit = min(max(int(request.args.get('limit', DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+        except ValueError:
+            return jsonify({'error': 'limit must be an integer'}), 400
+
+        fields, error = parse_fields(request.args.get('fields'))
+        if error:
+            return jsonify({'error': error}), 400
+
+        # id and created_at are always selected because they form the cursor
+        selected = list(dict.fromkeys(fields + ['created_at', 'id']))
+        query = db.select(*[getattr(Prediction, field) for field in selected]).where(Prediction.user_id == user_id)
+
+        cursor = request.args.get('cursor')
+        if cursor:
+            try:
+                created_at, prediction_id = decode_cursor(cursor)
+            except Exception:
+                return jsonify({'error': 'Invalid cursor'}), 400
+            query = query.where(db.tuple_(Prediction.created_at, Prediction.id) < (created_at, prediction_id))
+
+        # Newest first, walking the (user_id, created_at, id) index; one extra row tells us if there is more
+        query = query.order_by(Prediction.created_at.desc(), Prediction.id.desc()).limit(limit + 1)
+        rows = db.session.execute(query).all()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id) if has_more else None
+
+        return jsonify({
+            'predictions': [{field: serialize_value(getattr(row, field)) for field in fields} for row in rows],
+            'next_cursor': next_cursor,
+            'has_more': has_more
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': 'Failed to fetch prediction history', 'details': str(e)}), 500
+
+
+def parse_fields(value):
+    """Requested columns in order, or (None, error) if any is unknown"""
+    if not value:
+        return HISTORY_FIELDS, None
+    fields = [field.strip() for field in value.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in HISTORY_FIELDS]
+    if unknown:
+        return None, f"Unknown fields: {', '.join(unknown)}"
+    return fields, None
+
+
+def parse_time_bound(value, end=False):
+    """ISO date or datetime as naive UTC, like created_at; a bare date used as an end bound covers the whole day"""
+    # fromisoformat only accepts a trailing Z from Python 3.11
+    if value.endswith(('Z', 'z')):
+        value = value[:-1] + '+00:00'
+    bound = datetime.fromisoformat(value)
+    if bound.tzinfo is not None:
+        bound = bound.astimezone(timezone.utc).replace(tzinfo=None)
+    if end and len(value) == 10:
+        bound += timedelta(days=1)
+    return bound
+
+
+def export_chunks(query, fields, export_format, chunk_size):
+    """Yield the export body one keyset page of rows at a time.
+
+    ``query`` must select created_at and id and be ordered by them. Each page
+    is its own short query and the session is closed before the page is sent,
+    so no transaction or connection stays open while a slow client reads.
+    """
+    if export_format == 'csv':
+        # The header goes out before the query runs, so the first byte is immediate
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(fields)
+        yield buffer.getvalue()
+
+    cursor = None
+    while True:
+        page = query if cursor is None else query.where(db.tuple_(Prediction.created_at, Prediction.id) > cursor)
+        try:
+            rows = db.session.execute(page.limit(chunk_size)).all()
+        finally:
+            db.session.close()
+        if not rows:
+            break
+        cursor = (rows[-1].created_at, rows[-1].id)
+
+        buffer = io.StringIO()
+        if export_format == 'csv':
+            csv.writer(buffer).writerows([serialize_value(getattr(row, field)) for field in fields] for row in rows)
+        else:
+            for row in rows:
+                buffer.write(json.dumps({field: serialize_value(getattr(row, field)) for field in fields}))
+                buffer.write('\n')
+        yield buffer.getvalue()
+        if len(rows) < chunk_size:
+            break
+
+
+@predictions.route('/export', methods=['GET'])
+@jwt_required()
+def export():
+    try:
+        user_id = current_user_id()
+
+        export_format = request.args.get('format', 'csv')
+        if export_format not in EXPORT_FORMATS:
+            return jsonify({'error': f"format must be one of: {', '.join(EXPORT_FORMATS)}"}), 400
+
+        fields, error = parse_fields(request.args.get('fields'))
+        if error:
+            return jsonify({'error': error}), 400
+
+        # id and created_at are always selected because they form the page cursor
+        selected = list(dict.fromkeys(fields + ['created_at', 'id']))
+        query = db.select(*[getattr(Prediction, field) for field in selected]).where(Prediction.user_id == user_id)
+        try:
+            if request.args.get('since'):
+                query = query.where(Prediction.created_at >= parse_time_bound(request.args['since']))
+            if request.args.get('until'):
+                query = query.where(Prediction.created_at < parse_time_bound(request.args['until'], end=True))
+        except ValueError:
+            return jsonify({'error': 'since and until must be ISO dates or datetimes'}), 400
+        if request.args.get('team'):
+            team = get_canonical_team_name(request.args['team'])
+            query = query.where(db.or_(Prediction.team1 == team, Prediction.team2 == team))
+
+        # Oldest first along the (user_id, created_at, id) index
+        query = query.order_by(Prediction.created_at, Prediction.id)
+
+        chunk_size = current_app.config.get('EXPORT_CHUNK_SIZE', 1000)
+        response = current_app.response_class(
+            stream_with_context(export_chunks(query, fields, export_format, chunk_size)),
+            mimetype=EXPORT_FORMATS[export_format]
+        )
+        response.headers['Content-Disposition'] = f'attachment; filename=predictions.{export_format}'
+        # Ask buffering proxies (nginx) to pass chunks through as they are produced
+        response.headers['X-Accel-Buffering'] = 'no'
+        return response
+
+    except Exception as e:
+        return jsonify({'error': 'Failed to export predictions', 'details': str(e)}), 500
+
+
+def grouped_counts(user_id, column):
+    """Predictions and average probability per value of ``column`` for one user"""
+    query = (
+        db.select(column, db.func.count(), db.func.avg(Prediction.predicted_probability))
+        .where(Prediction.user_id == user_id)
+        .group_by(column)
+    )
+    return {
+        value: {'predictions': count, 'average_probability': float(average)}
+        for value, count, average in db.session.execute(query)
+    }
+
+
+@predictions.route('/stats', methods=['GET'])
+@jwt_required()
+def stats():
+    try:
+        user_id = current_user_id()
+
+        total, average, first, last = db.session.execute(
+            db.select(
+                db.func.count(),
+                db.func.avg(Prediction.predicted_probability),
+                db.func.min(Prediction.created_at),
+                db.func.max(Prediction.created_at)
+            ).where(Prediction.user_id == user_id)
+        ).one()
+
+        # Appearances per team, whichever side of the fixture it was on
+        by_team = {}
+        for column in (Prediction.team1, Prediction.team2):
+            for team, team_stats in grouped_counts(user_id, column).items():
+                entry = by_team.setdefault(team, {'predictions': 0, 'probability_sum': 0.0})
+                entry['predictions'] += team_stats['predictions']
+                entry['probability_sum'] += team_stats['average_probability'] * team_stats['predictions']
+        by_team = {
+            team: {'predictions': entry['predictions'],
+                   'average_probability': entry['probability_sum'] / entry['predictions']}
+            for team, entry in by_team.items()
+        }
+
+        return jsonify({
+            'total_predictions': total,
+            'average_probability': float(average) if average is not None else None,
+            'first_prediction_at': serialize_value(first),
+            'last_prediction_at': serialize_value(last),
+            'by_toss_decision': grouped_counts(user_id, Prediction.toss_decision),
+            'by_toss_winner': grouped_counts(user_id, Prediction.toss_winner),
+            'by_city': grouped_counts(user_id, Prediction.city),
+            'by_team': by_team
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': 'Failed to fetch prediction stats', 'details': str(e)}), 500
@@ -0,0 +1,46 @@
+import itertools
+import logging
+
+from encoder import FEATURES
+
+logger = logging.getLogger(__name__)
+
+TOSS_DECISIONS = ['bat', 'field']
+
+
+def iter_scenarios(teams, cities):
+    """Yield every (team1, team2, toss_winner, toss_decision, city) the API accepts"""
+    for team1, team2 in itertools.permutations(teams, 2):
+        for toss_winner in (team1, team2):
+            for toss_decision in TOSS_DECISIONS:
+                for city in cities:
+                    yield (team1, team2, toss_winner, toss_decision, city)
+
+
+def scenario_key(data):
+    return tuple(data.get(field) for field in FEATURES)
+
+
+class ProbabilityTable:
+    """Toss-winner-wins probabilities for every valid scenario, scored once at load time"""
+
+    def __init__(self, model, encoder, teams, cities):
+        scenarios = list(iter_scenarios(teams, cities))
+
+        # One vectorized pass over the whole scenario grid
+        encoded = encoder.encode([dict(zip(FEATURES, scenario)) for scenario in scenarios])
+        probs = model.predict_proba(encoded)[:, 1]
+
+        self._table = dict(zip(scenarios, probs.tolist()))
+        logger.info(f"Precomputed probabilities for {len(self._table)} scenarios")
+
+    def __len__(self):
+        return len(self._table)
+
+    def lookup(self, data):
+        """Return the precomputed probability for a request, or None if it is not a valid scenario"""
+        try:
+            return self._table.get(scenario_key(data))
+        except TypeError:
+            # Unhashable field values can never match a scenario
+            return None
@@ -0,0 +1,36 @@
+import os
+import threading
+
+
+class ProcessLocal:
+    """A value created lazily, once per process.
+
+    Threads do not survive fork, so background threads and pools built in the
+    gunicorn master are useless to the workers. ``get()`` calls ``factory()``
+    the first time it runs in each process and returns that value afterwards.
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._value = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._value = self._factory()
+                    self._pid = os.getpid()
+        return self._value
+
+    def current(self):
+        """The value created in this process, or None"""
+        return self._value if self._pid == os.getpid() else None
+
+    def pop(self):
+        """Forget and return the value created in this process (None if there is none)"""
+        with self._lock:
+            value = self.current()
+            self._value = self._pid = None
+            return value
@@ -0,0 +1,68 @@
+import threading
+import time
+from collections import OrderedDict
+
+from metrics import registry
+
+cache_hits = registry.counter('scenario_cache_hits_total', 'Scenario lookups answered from the cache')
+cache_misses = registry.counter('scenario_cache_misses_total', 'Scenario lookups that had to be computed')
+
+
+class ScenarioCache:
+    """Bounded LRU cache with a per-entry time to live, keyed on a normalized scenario.
+
+    ``clear()`` bumps a generation number, so a value computed from data that
+    changed while it was being computed is returned but never stored.
+    """
+
+    def __init__(self, max_size=1024, ttl=300.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+        registry.gauge('scenario_cache_entries', 'Scenarios currently cached', self.__len__)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, compute):
+        """Return the cached value for ``key``, calling ``compute()`` on a miss"""
+        if self.max_size <= 0:
+            return compute()
+        try:
+            hash(key)
+        except TypeError:
+            return compute()
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                cache_hits.inc()
+                return entry[1]
+            generation = self._generation
+        cache_misses.inc()
+
+        value = compute()
+        with self._lock:
+            if generation == self._generation:
+                self._entries[key] = (now + self.ttl, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return value
+
+    def contains(self, key):
+        """True if ``key`` has a live entry; does not count as a hit or refresh its position"""
+        try:
+            entry = self._entries.get(key)
+        except TypeError:
+            return False
+        return entry is not None and entry[0] > time.monotonic()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
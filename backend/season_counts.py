@@ -0,0 +1,77 @@
+import bisect
+
+
+class SeasonCounts:
+    """Counts per key and season, stored as running totals over the seasons.
+
+    ``totals[key][i]`` is the count for ``key`` over the first ``i`` seasons,
+    so the count for any range of seasons is one subtraction, however long
+    the history. Adding a count touches its season and the later ones.
+    """
+
+    def __init__(self, seasons=()):
+        self.seasons = sorted(set(seasons))
+        self.totals = {}
+        self._owned = set()  # keys whose rows are not shared with another instance
+
+    @classmethod
+    def from_counts(cls, seasons, *counts):
+        """Build from Series of counts indexed by (season, *key), summing them"""
+        index = cls(seasons)
+        position = {season: i + 1 for i, season in enumerate(index.seasons)}
+        for series in counts:
+            for (season, *key), count in series.items():
+                if count:
+                    index._row(key[0] if len(key) == 1 else tuple(key))[position[season]] += int(count)
+        for row in index.totals.values():
+            for i in range(1, len(row)):
+                row[i] += row[i - 1]
+        return index
+
+    def copy(self):
+        """Copy that shares its rows with this one until ``add`` touches them"""
+        clone = SeasonCounts()
+        clone.seasons = list(self.seasons)
+        clone.totals = dict(self.totals)
+        return clone
+
+    def _row(self, key):
+        row = self.totals.get(key)
+        if row is None:
+            row = [0] * (len(self.seasons) + 1)
+        elif key not in self._owned:
+            row = list(row)
+        self.totals[key] = row
+        self._owned.add(key)
+        return row
+
+    def add(self, season, key, amount=1):
+        i = bisect.bisect_left(self.seasons, season)
+        if i == len(self.seasons) or self.seasons[i] != season:
+            # New season: its running total starts where the previous season's ends
+            self.seasons.insert(i, season)
+            self.totals = {k: row[:i + 1] + row[i:] for k, row in self.totals.items()}
+            self._owned = set(self.totals)
+        row = self._row(key)
+        for j in range(i + 1, len(row)):
+            row[j] += amount
+
+    def bounds(self, season_from=None, season_to=None):
+        """Positions in the running totals delimiting the seasons in the (inclusive) range"""
+        lo = 0 if season_from is None else bisect.bisect_left(self.seasons, season_from)
+        hi = len(self.seasons) if season_to is None else bisect.bisect_right(self.seasons, season_to)
+        return lo, max(lo, hi)
+
+    def get(self, key, season_from=None, season_to=None):
+        row = self.totals.get(key)
+        if row is None:
+            return 0
+        if season_from is None and season_to is None:
+            return row[-1]
+        lo, hi = self.bounds(season_from, season_to)
+        return row[hi] - row[lo]
+
+    def counts(self, season_from=None, season_to=None):
+        """Non-zero count per key over the season range"""
+        lo, hi = self.bounds(season_from, season_to)
+        return {key: row[hi] - row[lo] for key, row in self.totals.items() if row[hi] != row[lo]}
@@ -0,0 +1,348 @@
+import logging
+import os
+import threading
+import time
+
+from artifacts import file_signature
+from metrics import registry
+from process_local import ProcessLocal
+
+# NumPy, pandas and the model modules are imported by load_serving_state(), so
+# processes that never serve a prediction (auth, health checks) skip them.
+
+logger = logging.getLogger(__name__)
+
+inference_latency = registry.histogram(
+    'inference_stage_seconds', 'Time spent computing a scenario, by stage')
+state_reloads = registry.counter(
+    'serving_state_reloads_total', 'Serving state reloads, by result')
+
+
+class ServingState:
+    """Everything requests read that is derived from the model and dataset artifacts.
+
+    Built once (in the master process when a preforking server preloads the
+    app) and only read afterwards, so forked workers share its memory. A
+    reload builds a new instance and swaps it in; it is never patched in place
+    apart from the ingestion counters.
+    """
+
+    def __init__(self, encoder, predictor, match_stats, match_log, analysis_cache, scenario_cache,
+                 probability_table=None, model_version=None, signatures=None):
+        self.encoder = encoder
+        self.predictor = predictor
+        self.match_stats = match_stats
+        self.match_log = match_log
+        self.analysis_cache = analysis_cache
+        self.scenario_cache = scenario_cache
+        self.probability_table = probability_table
+        self.model_version = model_version
+        # File signatures of the artifacts this state was built from, for the reloader
+        self.signatures = signatures or {}
+
+    def fixture_stats(self, team1, team2, season_from=None, season_to=None):
+        """Team and head-to-head stats for a fixture over a season range (all seasons by default)"""
+        seasons = (season_from, season_to)
+        # One snapshot, so an ingest published meanwhile cannot mix old and new counts
+        match_stats = self.match_stats
+        return {
+            'team1_stats': match_stats.team_stats(team1, *seasons),
+            'team2_stats': match_stats.team_stats(team2, *seasons),
+            'head_to_head': match_stats.head_to_head(team1, team2, *seasons)
+        }
+
+    def scenario(self, data, season_from=None, season_to=None):
+        """Probability plus historical team and head-to-head stats for one scenario, cached"""
+        from probability_table import scenario_key
+
+        def compute():
+            probability = float(self.predict_probability(data))
+            with inference_latency.timer(stage='stats'):
+                return {'probability': probability,
+                        **self.fixture_stats(data['team1'], data['team2'], season_from, season_to)}
+
+        return self.scenario_cache.get(scenario_key(data) + (season_from, season_to), compute)
+
+    def is_cheap(self, data, season_from=None, season_to=None):
+        """True if the scenario is answered without running the model: cached, or in the probability table"""
+        from probability_table import scenario_key
+
+        if self.scenario_cache.contains(scenario_key(data) + (season_from, season_to)):
+            return True
+        return self.probability_table is not None and self.probability_table.lookup(data) is not None
+
+    def scenario_grid(self, team1, team2, cities, season_from=None, season_to=None):
+        """Probabilities for every toss winner, toss decision and city of one fixture, cached"""
+        from probability_table import TOSS_DECISIONS
+
+        def compute():
+            records = [{'team1': team1, 'team2': team2, 'toss_winner': toss_winner,
+                        'toss_decision': toss_decision, 'city': city}
+                       for toss_winner in (team1, team2) for toss_decision in TOSS_DECISIONS for city in cities]
+            probs = iter(self.predict_probabilities(records).tolist())
+            grid = {toss_winner: {toss_decision: {city: next(probs) for city in cities}
+                                  for toss_decision in TOSS_DECISIONS}
+                    for toss_winner in (team1, team2)}
+            return {'probabilities': grid, **self.fixture_stats(team1, team2, season_from, season_to)}
+
+        return self.scenario_cache.get(('grid', team1, team2, tuple(cities), season_from, season_to), compute)
+
+    def predict_probability(self, data):
+        """Probability that the toss winner wins, from the precomputed table when possible"""
+        if self.probability_table is not None:
+            with inference_latency.timer(stage='table_lookup'):
+                prob = self.probability_table.lookup(data)
+            if prob is not None:
+                return prob
+
+        with inference_latency.timer(stage='encode'):
+            encoded = self.encoder.encode_row(data)
+        with inference_latency.timer(stage='predict_proba'):
+            return self.predictor.predict_proba(encoded)[0][1]
+
+    def predict_probabilities(self, records):
+        """Probabilities for many scenarios with at most one predict_proba call"""
+        import numpy as np
+
+        probs = np.empty(len(records))
+        missing = []
+        for i, record in enumerate(records):
+            prob = self.probability_table.lookup(record) if self.probability_table is not None else None
+            if prob is None:
+                missing.append(i)
+            else:
+                probs[i] = prob
+
+        if missing:
+            encoded = self.encoder.encode([records[i] for i in missing])
+            probs[missing] = self.predictor.predict_proba(encoded)[:, 1]
+        return probs
+
+
+def model_signature():
+    from model_store import FEATURES_PKL, MODEL_FLAT, MODEL_PKL
+    return file_signature(MODEL_PKL, FEATURES_PKL, os.path.join(MODEL_FLAT, 'meta.json'))
+
+
+def dataset_signature():
+    from dataset import MATCHES_CSV
+    return file_signature(MATCHES_CSV)
+
+
+def check_smoke_scenarios(predictor, encoder, probability_table, teams, cities):
+    """Score a few scenarios every way requests can and raise ValueError if the answers are unusable"""
+    import numpy as np
+    from probability_table import TOSS_DECISIONS
+
+    scenarios = [{
+        'team1': team,
+        'team2': teams[(i + 1) % len(teams)],
+        'toss_winner': team,
+        'toss_decision': TOSS_DECISIONS[i % len(TOSS_DECISIONS)],
+        'city': cities[i % len(cities)]
+    } for i, team in enumerate(teams)]
+
+    probs = predictor.predict_proba(encoder.encode(scenarios))[:, 1]
+    if not np.all(np.isfinite(probs)) or probs.min() < 0 or probs.max() > 1:
+        raise ValueError(f"Smoke scenarios produced invalid probabilities: {probs.tolist()}")
+    single = predictor.predict_proba(encoder.encode_row(scenarios[0]))[0][1]
+    if not np.isclose(single, probs[0]):
+        raise ValueError(f"Row and batch encodings disagree: {single} != {probs[0]}")
+    if probability_table is not None:
+        table = np.array([probability_table.lookup(scenario) for scenario in scenarios], dtype=float)
+        if not np.allclose(table, probs):
+            raise ValueError("Probability table disagrees with the model on the smoke scenarios")
+
+
+def _load_model(config, teams, cities):
+    from encoder import FeatureEncoder
+    from model_store import load_model, model_version
+    from probability_table import ProbabilityTable
+
+    # Load the model (memory-mapped flat arrays when exported) and features
+    try:
+        predictor, model_cols = load_model(config['INFERENCE_ENGINE'])
+        encoder = FeatureEncoder(model_cols)
+        version = model_version()
+        logger.info(f"Model {version} and features loaded successfully ({type(predictor).__name__})")
+    except Exception as e:
+        logger.error(f"Error loading model: {str(e)}")
+        raise
+
+    # Score every valid scenario once so requests become a table lookup
+    probability_table = None
+    if config['PRECOMPUTE_PREDICTIONS']:
+        try:
+            probability_table = ProbabilityTable(predictor, encoder, teams, cities)
+        except Exception as e:
+            logger.error(f"Error precomputing probability table: {str(e)}")
+
+    check_smoke_scenarios(predictor, encoder, probability_table, teams, cities)
+    return predictor, encoder, probability_table, version
+
+
+def _load_dataset():
+    from analysis_stats import AnalysisAggregates
+    from dataset import MATCHES_CSV, load_matches
+    from dataset_cache import DatasetCache
+    from ingest import MatchLog
+    from match_stats import MatchStatsIndex
+
+    # Index historical match stats once instead of scanning the dataset per request
+    try:
+        matches_df = load_matches()
+        match_stats = MatchStatsIndex.from_frame(matches_df)
+        match_log = MatchLog(MATCHES_CSV, next_id=int(matches_df['id'].max()) + 1 if len(matches_df) else 1)
+        del matches_df
+        logger.info("Match statistics indexed successfully")
+    except Exception as e:
+        logger.error(f"Error indexing match statistics: {str(e)}")
+        raise
+
+    # Warm the analysis aggregates so forked workers inherit them
+    analysis_cache = DatasetCache(MATCHES_CSV, AnalysisAggregates.from_csv)
+    try:
+        analysis_cache.get()
+    except Exception as e:
+        logger.error(f"Error computing analysis stats: {str(e)}")
+
+    return match_stats, match_log, analysis_cache
+
+
+def _build_state(config, model, dataset, signatures):
+    from scenario_cache import ScenarioCache
+
+    predictor, encoder, probability_table, version = model
+    match_stats, match_log, analysis_cache = dataset
+    # Answers for repeated scenarios; every new state starts with an empty cache
+    scenario_cache = ScenarioCache(config['SCENARIO_CACHE_SIZE'], config['SCENARIO_CACHE_TTL'])
+    return ServingState(encoder, predictor, match_stats, match_log, analysis_cache, scenario_cache,
+                        probability_table, model_version=version, signatures=signatures)
+
+
+def load_serving_state(config, teams, cities):
+    signatures = {'model': model_signature(), 'dataset': dataset_signature()}
+    model = _load_model(config, teams, cities)
+    return _build_state(config, model, _load_dataset(), signatures)
+
+
+_state = None
+_state_lock = threading.Lock()
+
+
+def get_state():
+    return _state
+
+
+def set_state(state):
+    global _state
+    _state = state
+
+
+def ensure_state(config, teams, cities):
+    """Return the serving state, loading it first if nothing has yet"""
+    state = _state
+    if state is None:
+        with _state_lock:
+            if _state is None:
+                set_state(load_serving_state(config, teams, cities))
+            state = _state
+    return state
+
+
+def reload_state(config, teams, cities, dataset_lock):
+    """Load the artifacts that changed next to the current state, then swap it out.
+
+    Unchanged parts are shared with the current state. The dataset is re-read
+    and the new state swapped in while holding ``dataset_lock`` (the lock
+    ingestion appends under), so no appended match is missed. Requests that
+    already hold the old state finish with it. Returns the new state, or None
+    when loading or the smoke check failed and the current state was kept.
+    """
+    previous = ensure_state(config, teams, cities)
+    started = time.perf_counter()
+    try:
+        signatures = {'model': model_signature()}
+        if signatures['model'] == previous.signatures.get('model'):
+            model = (previous.predictor, previous.encoder, previous.probability_table, previous.model_version)
+        else:
+            model = _load_model(config, teams, cities)
+
+        with dataset_lock:
+            signatures['dataset'] = dataset_signature()
+            if signatures['dataset'] == previous.signatures.get('dataset'):
+                dataset = (previous.match_stats, previous.match_log, previous.analysis_cache)
+            else:
+                dataset = _load_dataset()
+            state = _build_state(config, model, dataset, signatures)
+            set_state(state)
+    except Exception as e:
+        state_reloads.inc(result='failed')
+        logger.error(f"Reload failed, still serving model {previous.model_version}: {str(e)}")
+        return None
+
+    state_reloads.inc(result='ok')
+    logger.info(f"Reloaded serving state in {time.perf_counter() - started:.2f}s: "
+                f"model {previous.model_version} -> {state.model_version}")
+    return state
+
+
+class StateReloader:
+    """Reloads the serving state in the background when its artifacts change.
+
+    A watcher thread stats the model and dataset files every ``interval``
+    seconds and reloads once a change has held still for one poll, so a
+    retrain that writes the pickles and then the flat export reloads once.
+    Each process starts its own watcher on first use. At most one reload runs
+    at a time, and artifacts that fail to load are not retried until they
+    change again.
+    """
+
+    def __init__(self, reload, interval=10.0):
+        self._reload = reload
+        self.interval = interval
+        self._running = threading.Lock()
+        self._watcher = ProcessLocal(self._start_watcher)
+
+    def _start_watcher(self):
+        thread = threading.Thread(target=self._watch, name='state-reloader', daemon=True)
+        thread.start()
+        return thread
+
+    def ensure_started(self):
+        if self.interval > 0:
+            self._watcher.get()
+
+    def trigger(self):
+        """Start a reload in the background; False if one is already running"""
+        if not self._running.acquire(blocking=False):
+            return False
+        threading.Thread(target=self._run, name='state-reload', daemon=True).start()
+        return True
+
+    def _run(self):
+        try:
+            return self._reload()
+        finally:
+            self._running.release()
+
+    def _watch(self):
+        pending = failed = None
+        while True:
+            time.sleep(self.interval)
+            state = _state
+            if state is None:
+                continue
+            try:
+                current = {'model': model_signature(), 'dataset': dataset_signature()}
+            except Exception as e:
+                logger.error(f"Error checking serving artifacts: {str(e)}")
+                continue
+            if current == state.signatures or current == failed:
+                pending = None
+            elif current != pending:
+                pending = current
+            elif self._running.acquire(blocking=False):
+                pending = None
+                # Artifacts that failed to load are retried only once they change again
+                failed = current if self._run() is None else None
@@ -0,0 +1,115 @@
+"""Startup profiling for the API.
+
+    python startup.py profile [--top 25] [--path /health]
+    python startup.py check --budget 1.0 [--path /health]
+
+``profile`` reports import time per module (from ``python -X importtime``) and
+the time to import the app, build it and answer a first request. ``check``
+measures the same phases and exits non-zero when time-to-first-request is over
+the budget. Both run the app in fresh interpreters, so set PRELOAD_MODEL and
+friends in the environment to pick the startup path being measured.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def _run(args):
+    return subprocess.run([sys.executable] + args, cwd=HERE, capture_output=True, text=True, check=True)
+
+
+def import_times(module='app'):
+    """(module, self seconds, cumulative seconds, depth) for every module ``import module`` loads"""
+    stderr = _run(['-X', 'importtime', '-c', f'import {module}']).stderr
+    times = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip(' '))) // 2
+        times.append((name.strip(), int(self_us) / 1e6, int(cumulative_us) / 1e6, depth))
+    return times
+
+
+def measure(path='/health'):
+    """Time importing the app, building it and serving one GET ``path`` in this process"""
+    started = time.perf_counter()
+    import app as app_module
+    imported = time.perf_counter()
+    app = app_module.create_app()
+    created = time.perf_counter()
+    status = app.test_client().get(path).status_code
+    served = time.perf_counter()
+    return {
+        'path': path,
+        'status': status,
+        'import_seconds': imported - started,
+        'create_app_seconds': created - imported,
+        'first_request_seconds': served - created,
+        'time_to_first_request': served - started,
+        'modules_loaded': len(sys.modules)
+    }
+
+
+def measure_fresh(path='/health'):
+    """Run measure() in a fresh interpreter and return its result"""
+    output = _run([os.path.join(HERE, 'startup.py'), 'measure', '--path', path]).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def print_phases(result):
+    print(f"GET {result['path']} -> {result['status']} ({result['modules_loaded']} modules loaded)")
+    for phase in ('import_seconds', 'create_app_seconds', 'first_request_seconds', 'time_to_first_request'):
+        print(f"  {phase:<24} {result[phase]:8.3f}s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="API startup profiling")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    profile = subparsers.add_parser('profile', help="Import time per module and startup phases")
+    profile.add_argument('--top', type=int, default=25)
+    profile.add_argument('--path', default='/health')
+    check = subparsers.add_parser('check', help="Fail if time-to-first-request exceeds a budget")
+    check.add_argument('--budget', type=float, required=True, help="seconds")
+    check.add_argument('--path', default='/health')
+    measure_parser = subparsers.add_parser('measure', help="Measure startup in this process and print JSON")
+    measure_parser.add_argument('--path', default='/health')
+    args = parser.parse_args(argv)
+
+    if args.command == 'measure':
+        result = measure(args.path)
+        print(json.dumps(result))
+        return 0
+
+    result = measure_fresh(args.path)
+    if args.command == 'profile':
+        times = import_times()
+        print(f"{'imported by app':<40} {'cumulative ms':>14}")
+        for name, _, cumulative_seconds, _ in sorted((t for t in times if t[3] == 1), key=lambda t: -t[2])[:args.top]:
+            print(f"{name:<40} {cumulative_seconds * 1000:>14.1f}")
+        print()
+        print(f"{'slowest modules':<40} {'self ms':>14}")
+        for name, self_seconds, _, _ in sorted(times, key=lambda t: -t[1])[:args.top]:
+            print(f"{name:<40} {self_seconds * 1000:>14.1f}")
+        print()
+        print_phases(result)
+        return 0
+
+    print_phases(result)
+    if result['status'] >= 500:
+        print(f"FAIL: GET {args.path} returned {result['status']}")
+        return 1
+    if result['time_to_first_request'] > args.budget:
+        print(f"FAIL: time to first request {result['time_to_first_request']:.3f}s exceeds budget {args.budget:.3f}s")
+        return 1
+    print(f"OK: within budget {args.budget:.3f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
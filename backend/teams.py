@@ -0,0 +1,73 @@
+# Team name mappings
+TEAM_NAME_MAPPINGS = {
+    "Delhi Capitals": ["Delhi Daredevils", "Delhi Capitals"],
+    "Punjab Kings": ["Kings XI Punjab", "Punjab Kings"],
+    "Mumbai Indians": ["Mumbai Indians"],
+    "Chennai Super Kings": ["Chennai Super Kings"],
+    "Kolkata Knight Riders": ["Kolkata Knight Riders"],
+    "Rajasthan Royals": ["Rajasthan Royals"],
+    "Royal Challengers Bangalore": ["Royal Challengers Bangalore"],
+    "Sunrisers Hyderabad": ["Sunrisers Hyderabad"],
+    "Lucknow Super Giants": ["Lucknow Super Giants"],
+    "Gujarat Titans": ["Gujarat Titans"]
+}
+
+# Teams and cities the API accepts for fixtures
+VALID_TEAMS = [
+    "Mumbai Indians", "Delhi Capitals", "Chennai Super Kings",
+    "Kolkata Knight Riders", "Rajasthan Royals", "Royal Challengers Bangalore",
+    "Sunrisers Hyderabad", "Lucknow Super Giants", "Gujarat Titans", "Punjab Kings"
+]
+
+VALID_CITIES = [
+    "Mumbai", "Delhi", "Chennai", "Kolkata", "Hyderabad",
+    "Ahmedabad", "Bangalore", "Jaipur", "Pune"
+]
+
+TEAM_COLUMNS = ['team1', 'team2', 'toss_winner', 'winner']
+FIXTURE_TEAM_FIELDS = ['team1', 'team2', 'toss_winner']
+
+# Every known name (historical or current) -> current name, built once
+TEAM_ALIASES = {
+    historical_name: current_name
+    for current_name, historical_names in TEAM_NAME_MAPPINGS.items()
+    for historical_name in historical_names
+}
+
+def get_canonical_team_name(team_name):
+    """Convert historical team names to their current names"""
+    try:
+        return TEAM_ALIASES.get(team_name, team_name)
+    except TypeError:
+        return team_name
+
+def canonicalize_teams(series):
+    """Canonical names for a whole pandas column, remapping each distinct name once.
+
+    The column is viewed as a categorical and only its categories are mapped;
+    rows are then remapped with one array lookup on their codes. Missing values
+    stay missing.
+    """
+    import numpy as np
+    import pandas as pd
+
+    categorical = series if str(series.dtype) == 'category' else series.astype('category')
+    mapped = categorical.cat.categories.map(get_canonical_team_name)
+    if mapped.is_unique:
+        return categorical.cat.rename_categories(mapped)
+
+    categories = mapped.unique()
+    # Old code -> new code; the trailing -1 keeps missing values (code -1) missing
+    remap = np.append(categories.get_indexer(mapped), -1)
+    codes = remap[categorical.cat.codes.to_numpy()]
+    return pd.Series(pd.Categorical.from_codes(codes, categories=categories), index=series.index, name=series.name)
+
+def normalize_fixture(data):
+    """Copy of a request fixture with historical team names replaced by current ones"""
+    if not isinstance(data, dict):
+        return data
+    normalized = dict(data)
+    for field in FIXTURE_TEAM_FIELDS:
+        if isinstance(normalized.get(field), str):
+            normalized[field] = get_canonical_team_name(normalized[field])
+    return normalized
@@ -0,0 +1,29 @@
+import os
+import sys
+
+import pytest
+
+# The backend is a flat set of modules; make them importable from the tests
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+
+
+@pytest.fixture(autouse=True)
+def fresh_serving_state():
+    """Drop the process-wide serving state a test loaded, with whatever working directory it had"""
+    yield
+    import serving
+    serving.set_state(None)
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """The API with the model and match statistics loaded from the backend directory, on a scratch database"""
+    monkeypatch.chdir(BACKEND)
+    monkeypatch.setenv('MODEL_RELOAD_INTERVAL', '0')
+    import app as app_module
+
+    app = app_module.create_app({'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'test.db'}",
+                                 'PRELOAD_MODEL': True})
+    app_module.init_database(app)
+    return app
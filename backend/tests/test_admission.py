@@ -0,0 +1,94 @@
+import os
+
+import pytest
+
+from admission import AdmissionController, AdmissionRejected
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURE = {'team1': 'Mumbai Indians', 'team2': 'Delhi Capitals', 'toss_winner': 'Mumbai Indians',
+           'toss_decision': 'bat', 'city': 'Mumbai'}
+
+
+def test_cap_sheds_expensive_work_and_keeps_headroom_for_cheap():
+    controller = AdmissionController(max_concurrent=2, cheap_headroom=1)
+    release = controller.acquire('predict')
+    controller.acquire('predict')
+    with pytest.raises(AdmissionRejected) as shed:
+        controller.acquire('predict')
+    assert (shed.value.status, shed.value.reason, shed.value.retry_after) == (503, 'concurrency', 1)
+
+    release_cheap = controller.acquire('predict', cheap=True)
+    with pytest.raises(AdmissionRejected):
+        controller.acquire('predict', cheap=True)
+    # Cheap answers hold slots too: the cap counts everything in flight
+    release()
+    with pytest.raises(AdmissionRejected):
+        controller.acquire('predict')
+    release_cheap()
+    controller.acquire('predict')
+
+
+def test_token_bucket_limits_each_client():
+    controller = AdmissionController(rate=1.0, burst=2)
+    controller.check_rate('user:1', 'predict')
+    controller.check_rate('user:1', 'predict')
+    with pytest.raises(AdmissionRejected) as limited:
+        controller.check_rate('user:1', 'predict')
+    assert (limited.value.status, limited.value.reason) == (429, 'rate_limited')
+    assert limited.value.retry_after >= 1
+    controller.check_rate('user:2', 'predict')
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.chdir(BACKEND)
+    monkeypatch.setenv('MODEL_RELOAD_INTERVAL', '0')
+    import app as app_module
+
+    app = app_module.create_app({
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'test.db'}",
+        'PRELOAD_MODEL': True,
+        'ADMISSION_MAX_CONCURRENT': 1,
+        'ADMISSION_CHEAP_HEADROOM': 1,
+        'ADMISSION_MAX_WRITES': 1
+    })
+    app_module.init_database(app)
+    return app
+
+
+def test_saturated_cap_sheds_uncached_work_but_serves_table_hits(app):
+    from admission import admission
+
+    release = admission.acquire('test')
+    try:
+        client = app.test_client()
+        response = client.post('/predict/batch', json={'fixtures': [FIXTURE]})
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == '1'
+        assert client.post('/predict', json=FIXTURE).status_code == 200
+    finally:
+        release()
+
+
+def test_synchronous_saves_have_their_own_cap(app):
+    from admission import admission
+
+    release = admission.acquire_write('test')
+    try:
+        response = app.test_client().post('/predict', json=FIXTURE)
+        assert response.status_code == 503
+        assert 'Retry-After' in response.headers
+    finally:
+        release()
+    assert app.test_client().post('/predict', json=FIXTURE).status_code == 200
+
+
+def test_rate_limited_client_gets_429(app):
+    from admission import admission
+
+    admission.configure(max_concurrent=0, cheap_headroom=0, rate=0.001, burst=1)
+    client = app.test_client()
+    assert client.post('/predict', json=FIXTURE).status_code == 200
+    response = client.post('/predict', json=FIXTURE)
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) >= 1
@@ -0,0 +1,41 @@
+import hashlib
+
+from dataset_cache import DatasetCache, file_digest
+
+
+def read_lines(path):
+    with open(path) as f:
+        return f.read().splitlines()
+
+
+def append_line(path, line):
+    with open(path, 'a') as f:
+        f.write(line + '\n')
+    return hashlib.sha256(line.encode()).hexdigest()
+
+
+def test_etag_after_append_matches_a_fresh_read(tmp_path):
+    path = str(tmp_path / 'rows.csv')
+    with open(path, 'w') as f:
+        f.write('a\nb\n')
+    cache = DatasetCache(path, read_lines)
+    value, etag = cache.get()
+    assert value == ['a', 'b'] and etag == file_digest(path)
+
+    cache.append(lambda: append_line(path, 'c'), lambda rows: rows + ['c'])
+
+    # Another worker reading the same file has to agree on the version
+    value, etag = cache.get()
+    assert value == ['a', 'b', 'c']
+    assert etag == DatasetCache(path, read_lines).get()[1] == file_digest(path)
+
+
+def test_analysis_stats_not_modified(app):
+    client = app.test_client()
+    response = client.get('/analysis/stats')
+    assert response.status_code == 200
+    etag = response.headers['ETag']
+
+    response = client.get('/analysis/stats', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.headers['ETag'] == etag
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+from encoder import FEATURES, FeatureEncoder
+
+RECORDS = [
+    {'team1': 'Mumbai Indians', 'team2': 'Delhi Capitals', 'toss_winner': 'Delhi Capitals',
+     'toss_decision': 'field', 'city': 'Mumbai'},
+    {'team1': 'Delhi Capitals', 'team2': 'Chennai Super Kings', 'toss_winner': 'Delhi Capitals',
+     'toss_decision': 'bat', 'city': 'Chennai'},
+    {'team1': 'Chennai Super Kings', 'team2': 'Mumbai Indians', 'toss_winner': 'Mumbai Indians',
+     'toss_decision': 'bat', 'city': 'Delhi'},
+]
+
+
+def test_matches_get_dummies_drop_first():
+    df = pd.DataFrame(RECORDS)
+    dummies = pd.get_dummies(df[FEATURES], drop_first=True).astype(np.float32)
+    encoder = FeatureEncoder.from_frame(df)
+
+    assert encoder.columns == list(dummies.columns)
+    np.testing.assert_array_equal(encoder.encode(RECORDS), dummies.to_numpy())
+
+
+def test_row_batch_and_frame_encodings_agree():
+    df = pd.DataFrame(RECORDS)
+    encoder = FeatureEncoder.from_frame(df)
+    batch = encoder.encode(RECORDS)
+
+    for i, record in enumerate(RECORDS):
+        np.testing.assert_array_equal(encoder.encode_row(record)[0], batch[i])
+    np.testing.assert_array_equal(encoder.encode_frame(df), batch)
+    np.testing.assert_array_equal(encoder.encode_frame(df.astype('category')), batch)
+
+
+def test_unknown_values_encode_as_zeros():
+    encoder = FeatureEncoder.from_frame(pd.DataFrame(RECORDS))
+    record = dict(RECORDS[0], city='Nowhere', team1=None)
+    row = encoder.encode_row(record)[0]
+    assert encoder.column_index('city', 'Nowhere') is None
+    assert row.sum() == encoder.encode_row(dict(RECORDS[0], city='Chennai', team1='Chennai Super Kings'))[0].sum()
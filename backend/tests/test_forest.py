@@ -0,0 +1,30 @@
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+from forest import FlatForest, check_parity
+from model_store import export_model, read_flat_model
+
+
+def fitted_forest():
+    rng = np.random.default_rng(0)
+    X = rng.integers(0, 2, size=(300, 12)).astype(np.float32)
+    y = (X[:, 0] + X[:, 3] + rng.random(300) > 1.5).astype(int)
+    return RandomForestClassifier(n_estimators=15, max_depth=6, random_state=0).fit(X, y), X
+
+
+def test_flat_forest_matches_sklearn():
+    model, X = fitted_forest()
+    forest = FlatForest.from_sklearn(model)
+    np.testing.assert_allclose(forest.predict_proba(X), model.predict_proba(X), rtol=0, atol=1e-12)
+    np.testing.assert_allclose(forest.predict_proba(X[:1]), model.predict_proba(X[:1]), rtol=0, atol=1e-12)
+
+
+def test_exported_arrays_round_trip(tmp_path):
+    model, X = fitted_forest()
+    out_dir = tmp_path / 'model_flat'
+    columns = [f"f{i}" for i in range(X.shape[1])]
+    export_model(model, columns, str(out_dir))
+
+    forest, loaded_columns = read_flat_model(str(out_dir))
+    assert loaded_columns == columns
+    check_parity(forest, model, X)
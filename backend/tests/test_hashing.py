@@ -0,0 +1,49 @@
+import threading
+
+import pytest
+
+from hashing import HashPool, HashPoolBusy, hash_pool
+
+
+def occupy(pool):
+    """Hold the pool's only slot until the returned release() is called"""
+    started, release = threading.Event(), threading.Event()
+
+    def block():
+        started.set()
+        release.wait()
+
+    thread = threading.Thread(target=pool.run, args=('test', block))
+    thread.start()
+    started.wait()
+
+    def done():
+        release.set()
+        thread.join()
+    return done
+
+
+def test_pool_rejects_work_it_cannot_queue():
+    pool = HashPool(workers=1, max_pending=0, queue_budget=2.0)
+    release = occupy(pool)
+    try:
+        with pytest.raises(HashPoolBusy) as error:
+            pool.run('test', lambda: None)
+        assert error.value.retry_after == 2
+    finally:
+        release()
+    assert pool.run('test', lambda: 'ok') == 'ok'
+
+
+def test_login_returns_503_when_hashing_is_saturated(app):
+    client = app.test_client()
+    hash_pool.configure(workers=1, max_pending=0, queue_budget=3.0)
+    release = occupy(hash_pool)
+    try:
+        response = client.post('/auth/login', json={'username': 'PRAVESH', 'password': 'PRAVESH'})
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == '3'
+    finally:
+        release()
+    response = client.post('/auth/login', json={'username': 'PRAVESH', 'password': 'PRAVESH'})
+    assert response.status_code == 200
@@ -0,0 +1,94 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MATCH = {'season': 2017, 'team1': 'Mumbai Indians', 'team2': 'Delhi Daredevils', 'toss_winner': 'Mumbai Indians',
+         'toss_decision': 'field', 'winner': 'Delhi Capitals', 'venue': 'Wankhede Stadium', 'city': 'Mumbai',
+         'win_by_runs': 12}
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    # A private copy of matches.csv; the model files are only read
+    shutil.copy(os.path.join(BACKEND, 'matches.csv'), tmp_path)
+    for name in ('ipl_toss_win_model.pkl', 'model_features.pkl', 'model_flat'):
+        if os.path.exists(os.path.join(BACKEND, name)):
+            os.symlink(os.path.join(BACKEND, name), tmp_path / name)
+    monkeypatch.chdir(tmp_path)
+    for name, value in (('PRELOAD_MODEL', '0'), ('MODEL_RELOAD_INTERVAL', '0'),
+                        ('PRECOMPUTE_PREDICTIONS', '0'), ('ADMIN_USERS', 'PRAVESH')):
+        monkeypatch.setenv(name, value)
+    import app as app_module
+
+    app = app_module.create_app({'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'test.db'}"})
+    app_module.init_database(app)
+    client = app.test_client()
+    token = client.post('/auth/login', json={'username': 'PRAVESH', 'password': 'PRAVESH'}).json['access_token']
+    client.environ_base['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+    return client
+
+
+@pytest.mark.parametrize('bad', [
+    {'venue': ['X']},
+    {'city': {'name': 'Mumbai'}},
+    {'date': 'line\nbreak'},
+    {'win_by_runs': 'abc'},
+    {'win_by_wickets': -1},
+    {'dl_applied': 0.5},
+    {'team2': 'Deccan Chargers'},
+])
+def test_rejected_batch_leaves_csv_unchanged(client, bad):
+    with open('matches.csv', 'rb') as f:
+        before = f.read()
+    response = client.post('/matches/ingest', json={'matches': [MATCH, dict(MATCH, **bad)]})
+    assert response.status_code == 400
+    assert response.json['details'][0]['index'] == 1
+    with open('matches.csv', 'rb') as f:
+        assert f.read() == before
+
+
+def test_counters_after_ingest_equal_a_rebuild(client):
+    from analysis_stats import AnalysisAggregates
+    from dataset import load_matches
+    from match_stats import MatchStatsIndex
+    from serving import get_state
+    from teams import VALID_TEAMS
+
+    # Build the cached aggregates first, so the ingest has to update them rather than re-read the file
+    assert client.get('/analysis/stats').status_code == 200
+    # An existing season and one the counters have never seen
+    matches = [MATCH, dict(MATCH, season=2031, toss_winner='Delhi Capitals', toss_decision='bat',
+                           winner='Mumbai Indians', venue='New Ground', win_by_runs='', win_by_wickets='4')]
+    response = client.post('/matches/ingest', json={'matches': matches})
+    assert response.status_code == 201
+
+    state = get_state()
+    rebuilt = MatchStatsIndex.from_frame(load_matches('matches.csv'))
+    for seasons in ((None, None), (2017, 2017), (2031, None), (None, 2016)):
+        for team in VALID_TEAMS:
+            assert state.match_stats.team_stats(team, *seasons) == rebuilt.team_stats(team, *seasons)
+        assert (state.match_stats.head_to_head('Mumbai Indians', 'Delhi Capitals', *seasons)
+                == rebuilt.head_to_head('Mumbai Indians', 'Delhi Capitals', *seasons))
+
+    # The value the ingest published; get() would hide a missed update by rebuilding from the file
+    aggregates = state.analysis_cache._state[2]
+    expected = AnalysisAggregates.from_csv('matches.csv')
+    for seasons in ((None, None), (2031, 2031)):
+        assert aggregates.to_dict(VALID_TEAMS, *seasons) == expected.to_dict(VALID_TEAMS, *seasons)
+
+
+def test_convert_rejects_non_numeric_counts(tmp_path):
+    from dataset import convert_csv
+
+    csv_path = tmp_path / 'matches.csv'
+    df = pd.read_csv(os.path.join(BACKEND, 'matches.csv'), nrows=5).astype({'win_by_runs': object})
+    df.loc[2, 'win_by_runs'] = 'abc'
+    df.to_csv(csv_path, index=False)
+
+    with pytest.raises(ValueError):
+        convert_csv(str(csv_path), str(tmp_path / 'matches_columnar'))
+    assert not os.path.exists(tmp_path / 'matches_columnar')
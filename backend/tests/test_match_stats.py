@@ -0,0 +1,48 @@
+import os
+
+import pytest
+
+from dataset import load_matches
+from match_stats import MatchStatsIndex
+from teams import VALID_TEAMS
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope='module')
+def matches():
+    return load_matches(os.path.join(BACKEND, 'matches.csv'), os.path.join(BACKEND, 'matches_columnar')).astype({
+        column: object for column in ('team1', 'team2', 'toss_winner', 'winner')})
+
+
+def filtered_team_stats(df, team):
+    """What the endpoints computed by filtering the frame on every request"""
+    played = df[(df['team1'] == team) | (df['team2'] == team)]
+    total, wins = len(played), int((played['winner'] == team).sum())
+    return {'total_matches': total, 'toss_wins': int((played['toss_winner'] == team).sum()),
+            'match_wins': wins, 'win_rate': wins / total if total > 0 else 0}
+
+
+def test_team_stats_equal_filtering(matches):
+    index = MatchStatsIndex.from_frame(matches)
+    for team in VALID_TEAMS + ['Unknown XI']:
+        assert index.team_stats(team) == filtered_team_stats(matches, team)
+        seasons = matches[matches['season'].between(2012, 2014)]
+        assert index.team_stats(team, 2012, 2014) == filtered_team_stats(seasons, team)
+
+
+def test_head_to_head_is_symmetric_and_equals_filtering(matches):
+    index = MatchStatsIndex.from_frame(matches)
+    team1, team2 = 'Mumbai Indians', 'Chennai Super Kings'
+    meetings = matches[((matches['team1'] == team1) & (matches['team2'] == team2))
+                       | ((matches['team1'] == team2) & (matches['team2'] == team1))]
+    stats = index.head_to_head(team1, team2)
+    assert stats == {
+        'total_matches': len(meetings),
+        'team1_wins': int((meetings['winner'] == team1).sum()),
+        'team2_wins': int((meetings['winner'] == team2).sum()),
+        'team1_toss_wins': int((meetings['toss_winner'] == team1).sum()),
+        'team2_toss_wins': int((meetings['toss_winner'] == team2).sum())
+    }
+    swapped = index.head_to_head(team2, team1)
+    assert (swapped['team1_wins'], swapped['team2_wins']) == (stats['team2_wins'], stats['team1_wins'])
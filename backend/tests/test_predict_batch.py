@@ -0,0 +1,38 @@
+from models import Prediction
+
+FIXTURE = {'team1': 'Mumbai Indians', 'team2': 'Delhi Capitals', 'toss_winner': 'Mumbai Indians',
+           'toss_decision': 'bat', 'city': 'Mumbai'}
+
+
+def test_batch_reports_errors_per_fixture_and_scores_the_rest(app):
+    client = app.test_client()
+    fixtures = [
+        FIXTURE,
+        dict(FIXTURE, team2='Mumbai Indians'),
+        dict(FIXTURE, team2='Delhi Daredevils', toss_decision='field'),
+        dict(FIXTURE, city='Nowhere'),
+    ]
+    response = client.post('/predict/batch', json={'fixtures': fixtures})
+    assert response.status_code == 200
+    body = response.json
+    assert (body['succeeded'], body['failed']) == (2, 2)
+
+    results = body['results']
+    assert [result['index'] for result in results] == [0, 1, 2, 3]
+    assert 'error' in results[1] and 'error' in results[3]
+    assert 'probability' not in results[1]
+    for i in (0, 2):
+        single = client.post('/predict', json=fixtures[i]).json
+        assert f"{results[i]['probability']:.2%}" in single['result']
+        assert results[i]['head_to_head'] == single['head_to_head']
+
+    with app.app_context():
+        # Two from the batch, two from the single predictions
+        assert Prediction.query.count() == 4
+
+
+def test_batch_rejects_bad_envelopes(app):
+    client = app.test_client()
+    assert client.post('/predict/batch', json={'fixtures': []}).status_code == 400
+    app.config['PREDICT_BATCH_MAX_SIZE'] = 2
+    assert client.post('/predict/batch', json={'fixtures': [FIXTURE] * 3}).status_code == 400
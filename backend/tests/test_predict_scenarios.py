@@ -0,0 +1,38 @@
+import pytest
+
+from models import Prediction
+from serving import get_state
+
+
+def test_grid_matches_single_predictions(app):
+    client = app.test_client()
+    cities = ['Mumbai', 'Delhi', 'Mumbai']
+    response = client.post('/predict/scenarios', json={'team1': 'Mumbai Indians', 'team2': 'Delhi Daredevils',
+                                                       'cities': cities})
+    assert response.status_code == 200
+    body = response.json
+    assert body['team2'] == 'Delhi Capitals'
+
+    grid = body['probabilities']
+    assert set(grid) == {'Mumbai Indians', 'Delhi Capitals'}
+    for toss_winner, decisions in grid.items():
+        assert set(decisions) == {'bat', 'field'}
+        for toss_decision, by_city in decisions.items():
+            assert set(by_city) == {'Mumbai', 'Delhi'}
+            for city, probability in by_city.items():
+                fixture = {'team1': 'Mumbai Indians', 'team2': 'Delhi Capitals', 'toss_winner': toss_winner,
+                           'toss_decision': toss_decision, 'city': city}
+                assert probability == pytest.approx(get_state().predict_probability(fixture))
+
+    single = client.post('/predict', json=dict(fixture)).json
+    assert single['head_to_head'] == body['head_to_head']
+    with app.app_context():
+        # Only the single prediction is saved
+        assert Prediction.query.count() == 1
+
+
+def test_grid_rejects_unknown_cities(app):
+    client = app.test_client()
+    response = client.post('/predict/scenarios', json={'team1': 'Mumbai Indians', 'team2': 'Delhi Capitals',
+                                                       'cities': ['Nowhere']})
+    assert response.status_code == 400
@@ -0,0 +1,38 @@
+from prediction_store import PredictionWriter, prediction_row
+from models import db, Prediction
+
+SCENARIO = {'team1': 'Mumbai Indians', 'team2': 'Chennai Super Kings', 'toss_winner': 'Mumbai Indians',
+            'toss_decision': 'bat', 'city': 'Mumbai'}
+
+
+def test_write_behind_flushes_every_row(app):
+    writer = PredictionWriter(app, batch_size=7, flush_interval=0.05)
+    for i in range(50):
+        assert writer.submit(prediction_row(1, SCENARIO, i / 50))
+    writer.close()
+
+    with app.app_context():
+        assert db.session.query(Prediction).count() == 50
+
+
+def test_summary_upsert_matches_a_rebuild(app):
+    from models import PredictionSummary
+    from prediction_store import insert_predictions, rebuild_prediction_summaries
+
+    def summaries():
+        rows = db.session.query(PredictionSummary).order_by(
+            PredictionSummary.user_id, PredictionSummary.team_a, PredictionSummary.team_b, PredictionSummary.city)
+        return [(s.user_id, s.team_a, s.team_b, s.city, s.predictions, round(s.probability_sum, 9),
+                 s.team_a_toss_wins, s.team_b_toss_wins) for s in rows]
+
+    swapped = dict(SCENARIO, team1=SCENARIO['team2'], team2=SCENARIO['team1'])
+    other_city = dict(SCENARIO, city='Chennai', toss_winner='Chennai Super Kings')
+    with app.app_context():
+        # Two batches, so the second has to add to rows the first created
+        insert_predictions([prediction_row(1, SCENARIO, 0.6), prediction_row(1, swapped, 0.4),
+                            prediction_row(2, SCENARIO, 0.5)])
+        insert_predictions([prediction_row(1, other_city, 0.3), prediction_row(1, SCENARIO, 0.7)])
+        upserted = summaries()
+        rebuild_prediction_summaries()
+        assert upserted == summaries()
+        assert upserted[0][4] == 1 and sum(row[4] for row in upserted) == 5
@@ -0,0 +1,33 @@
+import os
+
+import numpy as np
+
+from encoder import FEATURES, FeatureEncoder
+from model_store import load_pickle
+from probability_table import ProbabilityTable, iter_scenarios
+from teams import VALID_CITIES, VALID_TEAMS
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_table_equals_predict_proba_for_every_scenario():
+    model, columns = load_pickle(os.path.join(BACKEND, 'ipl_toss_win_model.pkl'),
+                                 os.path.join(BACKEND, 'model_features.pkl'))
+    encoder = FeatureEncoder(columns)
+    table = ProbabilityTable(model, encoder, VALID_TEAMS, VALID_CITIES)
+
+    records = [dict(zip(FEATURES, scenario)) for scenario in iter_scenarios(VALID_TEAMS, VALID_CITIES)]
+    assert len(table) == len(records)
+    expected = model.predict_proba(encoder.encode(records))[:, 1]
+    np.testing.assert_array_equal([table.lookup(record) for record in records], expected)
+
+
+def test_lookup_misses_invalid_scenarios():
+    model, columns = load_pickle(os.path.join(BACKEND, 'ipl_toss_win_model.pkl'),
+                                 os.path.join(BACKEND, 'model_features.pkl'))
+    table = ProbabilityTable(model, FeatureEncoder(columns), VALID_TEAMS[:2], VALID_CITIES[:1])
+    fixture = {'team1': VALID_TEAMS[0], 'team2': VALID_TEAMS[1], 'toss_winner': VALID_TEAMS[0],
+               'toss_decision': 'bat', 'city': VALID_CITIES[0]}
+    assert table.lookup(fixture) is not None
+    assert table.lookup(dict(fixture, city='Nowhere')) is None
+    assert table.lookup(dict(fixture, city=['unhashable'])) is None
@@ -0,0 +1,54 @@
+import scenario_cache
+from scenario_cache import ScenarioCache
+
+
+class Calls:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, value):
+        def compute():
+            self.count += 1
+            return value
+        return compute
+
+
+def test_evicts_least_recently_used():
+    cache, compute = ScenarioCache(max_size=2), Calls()
+    cache.get('a', compute(1))
+    cache.get('b', compute(2))
+    cache.get('a', compute(1))  # 'a' is now the most recent
+    cache.get('c', compute(3))
+    assert cache.contains('a') and cache.contains('c') and not cache.contains('b')
+    assert compute.count == 3
+
+
+def test_entries_expire(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(scenario_cache.time, 'monotonic', lambda: now[0])
+    cache, compute = ScenarioCache(ttl=10), Calls()
+    assert cache.get('a', compute(1)) == 1
+    now[0] += 5
+    assert cache.get('a', compute(2)) == 1
+    now[0] += 10
+    assert not cache.contains('a')
+    assert cache.get('a', compute(2)) == 2
+    assert compute.count == 2
+
+
+def test_value_computed_across_clear_is_not_stored():
+    cache = ScenarioCache()
+
+    def compute():
+        cache.clear()
+        return 'stale'
+
+    assert cache.get('a', compute) == 'stale'
+    assert not cache.contains('a') and len(cache) == 0
+
+
+def test_unhashable_keys_bypass_the_cache():
+    cache, compute = ScenarioCache(), Calls()
+    assert cache.get(['a'], compute(1)) == 1
+    assert cache.get(['a'], compute(1)) == 1
+    assert compute.count == 2 and len(cache) == 0
@@ -0,0 +1,64 @@
+import pandas as pd
+
+from season_counts import SeasonCounts
+
+MATCHES = [(2008, 'A'), (2008, 'B'), (2009, 'A'), (2011, 'A'), (2011, 'B'), (2011, 'B')]
+
+
+def build(matches):
+    df = pd.DataFrame(matches, columns=['season', 'team'])
+    return SeasonCounts.from_counts(df['season'].unique().tolist(), df.groupby(['season', 'team']).size())
+
+
+def brute_force(matches, key, season_from=None, season_to=None):
+    return sum(1 for season, team in matches
+               if team == key and (season_from is None or season >= season_from)
+               and (season_to is None or season <= season_to))
+
+
+def test_ranges_match_filtering():
+    counts = build(MATCHES)
+    for season_from in (None, 2007, 2008, 2009, 2010, 2011, 2012):
+        for season_to in (None, 2007, 2008, 2009, 2010, 2011, 2012):
+            for key in ('A', 'B', 'C'):
+                assert counts.get(key, season_from, season_to) == brute_force(MATCHES, key, season_from, season_to)
+
+
+def test_add_matches_rebuild_including_new_seasons():
+    counts = build(MATCHES[:3])
+    for season, team in MATCHES[3:] + [(2005, 'C'), (2010, 'A')]:
+        counts.add(season, team)
+    expected = build(MATCHES + [(2005, 'C'), (2010, 'A')])
+    assert counts.seasons == expected.seasons
+    assert counts.totals == expected.totals
+
+
+def test_counts_omits_keys_without_matches_in_range():
+    counts = build(MATCHES)
+    assert counts.counts(2009, 2009) == {'A': 1}
+    assert counts.counts(2012) == {}
+
+
+def test_match_stats_with_matches_leaves_original_untouched():
+    from match_stats import MatchStatsIndex
+
+    rows = [{'season': 2008, 'team1': 'A', 'team2': 'B', 'toss_winner': 'A', 'winner': 'B'},
+            {'season': 2009, 'team1': 'A', 'team2': 'C', 'toss_winner': 'C', 'winner': 'A'}]
+    original = MatchStatsIndex.from_frame(pd.DataFrame(rows[:1]))
+    updated = original.with_matches(rows[1:])
+    assert original.matches.seasons == [2008]
+    assert original.team_stats('A')['total_matches'] == 1
+    assert updated.team_stats('A')['total_matches'] == 2
+    assert updated.head_to_head('A', 'C', 2009, 2009)['team1_wins'] == 1
+    assert updated.matches.totals == MatchStatsIndex.from_frame(pd.DataFrame(rows)).matches.totals
+
+
+def test_copy_leaves_original_untouched():
+    counts = build(MATCHES)
+    expected = build(MATCHES)
+    updated = counts.copy()
+    updated.add(2009, 'A')
+    updated.add(2010, 'C')
+    assert counts.seasons == expected.seasons
+    assert counts.totals == expected.totals
+    assert updated.totals == build(MATCHES + [(2009, 'A'), (2010, 'C')]).totals
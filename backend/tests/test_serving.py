@@ -0,0 +1,33 @@
+import threading
+
+import pytest
+
+import serving
+from teams import VALID_CITIES, VALID_TEAMS
+
+
+@pytest.fixture
+def changed_model(monkeypatch):
+    """Make the model files look rewritten so reload_state loads and checks them again"""
+    monkeypatch.setattr(serving, 'model_signature', lambda: ('retrained',))
+
+
+def test_failed_smoke_check_keeps_the_current_state(app, changed_model, monkeypatch):
+    previous = serving.get_state()
+
+    def reject(*args):
+        raise ValueError("Smoke scenarios produced invalid probabilities")
+    monkeypatch.setattr(serving, 'check_smoke_scenarios', reject)
+
+    assert serving.reload_state(app.config, VALID_TEAMS, VALID_CITIES, threading.Lock()) is None
+    assert serving.get_state() is previous
+
+
+def test_reload_swaps_in_a_new_state_sharing_the_unchanged_dataset(app, changed_model):
+    previous = serving.get_state()
+
+    state = serving.reload_state(app.config, VALID_TEAMS, VALID_CITIES, threading.Lock())
+    assert state is not None and serving.get_state() is state is not previous
+    assert state.signatures['model'] == ('retrained',)
+    assert state.match_stats is previous.match_stats and state.analysis_cache is previous.analysis_cache
+    assert state.predictor is not previous.predictor
@@ -0,0 +1,11 @@
+import pytest
+
+import startup
+
+
+@pytest.mark.parametrize('preload, budget', [('0', 1.5), ('1', 5.0)])
+def test_time_to_first_request_within_budget(monkeypatch, preload, budget):
+    monkeypatch.setenv('PRELOAD_MODEL', preload)
+    result = startup.measure_fresh()
+    assert result['status'] == 200
+    assert result['time_to_first_request'] < budget, result
@@ -0,0 +1,30 @@
+import pandas as pd
+
+from teams import canonicalize_teams, get_canonical_team_name, normalize_fixture
+
+
+def test_historical_names_map_to_current_ones():
+    assert get_canonical_team_name('Delhi Daredevils') == 'Delhi Capitals'
+    assert get_canonical_team_name('Kings XI Punjab') == 'Punjab Kings'
+    assert get_canonical_team_name('Mumbai Indians') == 'Mumbai Indians'
+    assert get_canonical_team_name('Unknown XI') == 'Unknown XI'
+    assert get_canonical_team_name(['not', 'hashable']) == ['not', 'hashable']
+
+
+def test_canonicalize_teams_matches_the_per_row_mapping():
+    names = ['Delhi Daredevils', 'Delhi Capitals', None, 'Kings XI Punjab', 'Mumbai Indians', 'Delhi Daredevils']
+    series = pd.Series(names, index=range(10, 16), name='team1')
+    result = canonicalize_teams(series)
+    expected = series.map(get_canonical_team_name, na_action='ignore')
+    assert result.index.equals(series.index) and result.name == 'team1'
+    assert result.astype(object).where(result.notna(), None).tolist() == expected.where(expected.notna(), None).tolist()
+    # Aliases merge into one category rather than two with the same name
+    assert sorted(result.cat.categories) == ['Delhi Capitals', 'Mumbai Indians', 'Punjab Kings']
+
+
+def test_normalize_fixture_only_touches_team_fields():
+    fixture = {'team1': 'Delhi Daredevils', 'team2': 'Kings XI Punjab', 'toss_winner': 'Kings XI Punjab',
+               'city': 'Delhi', 'winner': 'Delhi Daredevils'}
+    normalized = normalize_fixture(fixture)
+    assert normalized == dict(fixture, team1='Delhi Capitals', team2='Punjab Kings', toss_winner='Punjab Kings')
+    assert fixture['team1'] == 'Delhi Daredevils'
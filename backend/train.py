@@ -0,0 +1,278 @@
+"""Headless training pipeline for the toss-to-win model.
+
+    python train.py [--jobs -1] [--cv 3] [--no-search] [--no-plots] [--plots-dir training_plots]
+
+Builds the feature matrix once (cached per dataset content under
+feature_cache/), cross-validates the candidate models and grid-searches the
+random forest with every fold running in parallel, then fits the production
+forest and writes ipl_toss_win_model.pkl, model_features.pkl, the flat
+memory-mappable copy and training_report.json. Each file is written to a
+temporary name and renamed into place, so a running API never reads a partial
+file. Plots are rendered to PNG files with a non-interactive backend.
+"""
+import argparse
+import json
+import logging
+import os
+import tempfile
+import time
+
+import joblib
+import numpy as np
+from sklearn.base import clone
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
+from sklearn.model_selection import GridSearchCV, StratifiedKFold, train_test_split
+from sklearn.svm import SVC
+
+from dataset import MATCHES_CSV, load_matches
+from dataset_cache import file_digest
+from encoder import FEATURES, FeatureEncoder
+from model_store import FEATURES_PKL, MODEL_FLAT, MODEL_PKL, export_pickle
+
+logger = logging.getLogger(__name__)
+
+FEATURE_CACHE = 'feature_cache'
+TRAINING_REPORT = 'training_report.json'
+PLOTS_DIR = 'training_plots'
+RANDOM_STATE = 42
+
+PARAM_GRID = {
+    'n_estimators': [100, 150],
+    'max_depth': [None, 10, 20],
+    'min_samples_split': [2, 5]
+}
+
+
+def candidate_models():
+    return {
+        'Random Forest': RandomForestClassifier(n_estimators=100, random_state=RANDOM_STATE),
+        'Logistic Regression': LogisticRegression(max_iter=1000),
+        'SVM': SVC(probability=True),
+        'Gradient Boosting': GradientBoostingClassifier()
+    }
+
+
+def production_model(jobs):
+    return RandomForestClassifier(n_estimators=100, random_state=RANDOM_STATE, n_jobs=jobs)
+
+
+def training_frame(csv_path=MATCHES_CSV):
+    """Played matches with the binary target: did the toss winner win the match"""
+    df = load_matches(csv_path)
+    df = df.dropna(subset=['winner'])
+    return df.assign(target=(df['toss_winner'] == df['winner']).astype(int))
+
+
+def build_features(csv_path=MATCHES_CSV, cache_dir=FEATURE_CACHE):
+    """(X, y, columns, frame) for the dataset, reusing the cached matrix when the CSV is unchanged"""
+    df = training_frame(csv_path)
+    cache_path = os.path.join(cache_dir, f"{file_digest(csv_path)}.npz") if cache_dir else None
+    if cache_path and os.path.exists(cache_path):
+        with np.load(cache_path) as cached:
+            columns = [str(column) for column in cached['columns']]
+            if list(cached['fields']) == FEATURES:
+                logger.info(f"Loaded cached feature matrix {cache_path}")
+                return cached['X'], cached['y'], columns, df
+
+    encoder = FeatureEncoder.from_frame(df, FEATURES)
+    X = encoder.encode_frame(df)
+    y = df['target'].to_numpy()
+    if cache_path:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix='.features-', suffix='.npz', dir=cache_dir)
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, X=X, y=y, columns=np.array(encoder.columns), fields=np.array(FEATURES))
+        os.replace(tmp_path, cache_path)
+    return X, y, encoder.columns, df
+
+
+def _fit_and_score(name, estimator, X_fit, y_fit, X_eval, y_eval):
+    estimator.fit(X_fit, y_fit)
+    return name, accuracy_score(y_eval, estimator.predict(X_eval))
+
+
+def compare_models(X_train, y_train, X_test, y_test, cv, jobs):
+    """Cross-validated and held-out accuracy per candidate; every fit runs as one parallel task"""
+    candidates = candidate_models()
+    folds = list(StratifiedKFold(n_splits=cv, shuffle=True, random_state=RANDOM_STATE).split(X_train, y_train))
+
+    # One task per (candidate, fold) plus one held-out fit per candidate on the whole training split
+    tasks = [('cv', name, estimator, X_train[train], y_train[train], X_train[test], y_train[test])
+             for name, estimator in candidates.items() for train, test in folds]
+    tasks += [('test', name, estimator, X_train, y_train, X_test, y_test) for name, estimator in candidates.items()]
+    kinds = [task[0] for task in tasks]
+    scores = joblib.Parallel(n_jobs=jobs)(
+        joblib.delayed(_fit_and_score)(name, clone(estimator), X_fit, y_fit, X_eval, y_eval)
+        for _, name, estimator, X_fit, y_fit, X_eval, y_eval in tasks
+    )
+
+    report = {}
+    for name in candidates:
+        fold_scores = [score for kind, (candidate, score) in zip(kinds, scores) if kind == 'cv' and candidate == name]
+        test_score = next(score for kind, (candidate, score) in zip(kinds, scores) if kind == 'test' and candidate == name)
+        report[name] = {
+            'cv_accuracy_mean': float(np.mean(fold_scores)),
+            'cv_accuracy_std': float(np.std(fold_scores)),
+            'test_accuracy': float(test_score)
+        }
+    return report
+
+
+def grid_search(X_train, y_train, cv, jobs):
+    search = GridSearchCV(RandomForestClassifier(random_state=RANDOM_STATE), PARAM_GRID, cv=cv,
+                          scoring='accuracy', n_jobs=jobs)
+    search.fit(X_train, y_train)
+    return {'best_params': search.best_params_, 'best_cv_accuracy': float(search.best_score_)}
+
+
+def write_plots(out_dir, df, model, columns, y_test, y_pred):
+    """Render the analysis plots to PNG files (non-interactive backend, nothing is shown)"""
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+    except ImportError:
+        logger.warning("matplotlib is not installed; skipping plots")
+        return []
+
+    os.makedirs(out_dir, exist_ok=True)
+    written = []
+
+    def save(fig, name):
+        path = os.path.join(out_dir, name)
+        fig.tight_layout()
+        fig.savefig(path)
+        plt.close(fig)
+        written.append(path)
+
+    fig, ax = plt.subplots(figsize=(5, 4))
+    matrix = confusion_matrix(y_test, y_pred)
+    ax.imshow(matrix, cmap='Blues')
+    for (i, j), count in np.ndenumerate(matrix):
+        ax.text(j, i, str(count), ha='center', va='center')
+    ax.set(xlabel='Predicted', ylabel='Actual', title='Confusion Matrix', xticks=[0, 1], yticks=[0, 1])
+    save(fig, 'confusion_matrix.png')
+
+    by_decision = df.groupby('toss_decision', observed=True)['target'].mean()
+    fig, ax = plt.subplots(figsize=(6, 4))
+    ax.bar(by_decision.index.astype(str), by_decision.values)
+    ax.set(title='Effect of Toss Decision on Match Win (%)', xlabel='Toss Decision', ylabel='Win Probability',
+           ylim=(0, 1))
+    save(fig, 'toss_decision.png')
+
+    by_team = df.groupby('toss_winner', observed=True)['target'].mean().sort_values()
+    fig, ax = plt.subplots(figsize=(12, 6))
+    ax.barh(by_team.index.astype(str), by_team.values)
+    ax.set(title='Team-wise Toss to Match Win Conversion Rate', xlabel='Conversion Rate', ylabel='Team',
+           xlim=(0, 1))
+    save(fig, 'team_conversion.png')
+
+    order = np.argsort(model.feature_importances_)[::-1][:15]
+    fig, ax = plt.subplots(figsize=(12, 6))
+    ax.barh([columns[i] for i in order][::-1], model.feature_importances_[order][::-1])
+    ax.set(title='Top 15 Important Features for Toss-Win = Match-Win', xlabel='Importance', ylabel='Feature')
+    save(fig, 'feature_importance.png')
+    return written
+
+
+def _atomic_write(path, write):
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=f'.{os.path.basename(path)}-', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+
+def save_artifacts(model, columns, report, model_path=MODEL_PKL, features_path=FEATURES_PKL,
+                   report_path=TRAINING_REPORT, flat_dir=MODEL_FLAT):
+    _atomic_write(features_path, lambda f: joblib.dump(list(columns), f))
+    _atomic_write(model_path, lambda f: joblib.dump(model, f))
+    if flat_dir:
+        export_pickle(model_path, features_path, flat_dir)
+    _atomic_write(report_path, lambda f: f.write(json.dumps(report, indent=2).encode('utf-8')))
+
+
+def train(jobs=-1, cv=3, search=True, plots_dir=PLOTS_DIR, csv_path=MATCHES_CSV, cache_dir=FEATURE_CACHE):
+    """Run the pipeline and return (model, columns, report)"""
+    timings = {}
+
+    def timed(stage, func, *args):
+        started = time.perf_counter()
+        result = func(*args)
+        timings[stage] = time.perf_counter() - started
+        logger.info(f"{stage} took {timings[stage]:.2f}s")
+        return result
+
+    X, y, columns, df = timed('features', build_features, csv_path, cache_dir)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=RANDOM_STATE)
+
+    candidates = timed('compare_models', compare_models, X_train, y_train, X_test, y_test, cv, jobs)
+    search_report = timed('grid_search', grid_search, X_train, y_train, cv, jobs) if search else None
+
+    model = production_model(jobs)
+    timed('fit', model.fit, X_train, y_train)
+    # Serving predicts one row at a time; spinning up a thread pool per call only adds latency
+    model.set_params(n_jobs=None)
+    y_pred = model.predict(X_test)
+
+    plots = timed('plots', write_plots, plots_dir, df, model, columns, y_test, y_pred) if plots_dir else []
+
+    report = {
+        'dataset': {'path': csv_path, 'sha256': file_digest(csv_path), 'rows': int(len(y)),
+                    'train_rows': int(len(y_train)), 'test_rows': int(len(y_test))},
+        'features': len(columns),
+        'model': {
+            'params': {key: value for key, value in model.get_params().items() if key in
+                       ('n_estimators', 'max_depth', 'min_samples_split', 'random_state')},
+            'test_accuracy': float(accuracy_score(y_test, y_pred)),
+            'classification_report': classification_report(y_test, y_pred, output_dict=True, zero_division=0),
+            'confusion_matrix': confusion_matrix(y_test, y_pred).tolist()
+        },
+        'candidates': candidates,
+        'grid_search': search_report,
+        'plots': plots,
+        'timings_seconds': timings
+    }
+    return model, columns, report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the IPL toss-to-win model")
+    parser.add_argument('--jobs', type=int, default=-1, help="parallel workers (-1 = all cores)")
+    parser.add_argument('--cv', type=int, default=3, help="cross-validation folds")
+    parser.add_argument('--no-search', action='store_true', help="skip the random forest grid search")
+    parser.add_argument('--no-plots', action='store_true')
+    parser.add_argument('--plots-dir', default=PLOTS_DIR)
+    parser.add_argument('--csv', default=MATCHES_CSV)
+    parser.add_argument('--report', default=TRAINING_REPORT)
+    parser.add_argument('--no-cache', action='store_true', help="rebuild the feature matrix")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    model, columns, report = train(
+        jobs=args.jobs, cv=args.cv, search=not args.no_search,
+        plots_dir=None if args.no_plots else args.plots_dir, csv_path=args.csv,
+        cache_dir=None if args.no_cache else FEATURE_CACHE
+    )
+    report['timings_seconds']['total'] = time.perf_counter() - started
+    save_artifacts(model, columns, report, report_path=args.report)
+
+    print(f"Test accuracy: {report['model']['test_accuracy']:.4f}")
+    for name, scores in report['candidates'].items():
+        print(f"{name}: CV accuracy = {scores['cv_accuracy_mean']:.4f} ± {scores['cv_accuracy_std']:.4f}, "
+              f"test accuracy = {scores['test_accuracy']:.4f}")
+    if report['grid_search']:
+        print(f"Best Parameters: {report['grid_search']['best_params']} "
+              f"(CV accuracy {report['grid_search']['best_cv_accuracy']:.4f})")
+    print(f"Wrote {MODEL_PKL}, {FEATURES_PKL}, {MODEL_FLAT}/ and {args.report}")
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,10 @@
+"""WSGI entry point: ``gunicorn -c gunicorn.conf.py wsgi:app``"""
+import gc
+
+from app import create_app
+
+app = create_app()
+
+# Move everything loaded so far out of the collector's generations so that
+# garbage collection in the workers does not touch (and un-share) those pages
+gc.freeze()
@@ -43,6 +43,17 @@ export const makePrediction = async (formData) => {
     }
 };
 
+export const getScenarioMatrix = async ({ team1, team2, cities } = {}) => {
+    try {
+        // Probability for every toss winner, toss decision and city; nothing is saved
+        const response = await api.post('/predict/scenarios', { team1, team2, cities });
+        return response.data;
+    } catch (error) {
+        console.error('Scenario matrix error:', error.response || error);
+        throw new Error(error.response?.data?.error || 'Failed to fetch scenario matrix');
+    }
+};
+
 export const getPredictionStats = async () => {
     try {
         const response = await api.get('/predictions/stats');
@@ -86,12 +97,33 @@ export const registerUser = async (userData) => {
     }
 };
 
-export const getPredictionHistory = async () => {
+export const getPredictionHistory = async ({ cursor, limit, fields } = {}) => {
     try {
-        const response = await api.get('/predictions/history');
+        // Keyset pagination: pass back `next_cursor` from the previous page to continue
+        const params = {};
+        if (cursor) params.cursor = cursor;
+        if (limit) params.limit = limit;
+        if (fields) params.fields = Array.isArray(fields) ? fields.join(',') : fields;
+        const response = await api.get('/predictions/history', { params });
         return response.data;
     } catch (error) {
         console.error('History error:', error.response || error);
         throw new Error(error.response?.data?.error || 'Failed to fetch prediction history');
     }
-};
\ No newline at end of file
+};
+
+export const exportPredictionHistory = async ({ format = 'csv', since, until, team, fields } = {}) => {
+    try {
+        // Streamed by the server; returned as a Blob ready to download
+        const params = { format };
+        if (since) params.since = since;
+        if (until) params.until = until;
+        if (team) params.team = team;
+        if (fields) params.fields = Array.isArray(fields) ? fields.join(',') : fields;
+        const response = await api.get('/predictions/export', { params, responseType: 'blob' });
+        return response.data;
+    } catch (error) {
+        console.error('Export error:', error.response || error);
+        throw new Error('Failed to export prediction history');
+    }
+};